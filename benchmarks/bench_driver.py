@@ -0,0 +1,182 @@
+################################################################################
+# MPU6050 driver benchmarks
+#
+# Created: 2026-10-16
+#
+# Measure the per-sample cost of the driver read paths against the simulated
+# bus of sim.py, for every combination of accelerometer and gyroscope
+# full-scale range and DLPF mode, and write the results as JSON.
+#
+# alloc_bytes_per_call accounts only the memory allocated by the driver code
+# (mpu6050.py) and still referenced after the call, e.g. the returned lists
+# and dictionaries. Allocations of the simulated bus are excluded: the bytes
+# object returned by each transaction is accounted by transactions_per_sample.
+#
+#   python benchmarks/bench_driver.py -n 500 -o bench.json
+#
+################################################################################
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import sim
+sim.install()
+
+import mpu6050
+
+ACCEL_FULLSCALES = [2, 4, 8, 16]
+GYRO_FULLSCALES = [250, 500, 1000, 2000]
+DLPF_MODES = [0, 1, 2, 3, 4, 5, 6, 7]
+
+# FIFO drain period, in samples
+FIFO_BATCH = 50
+
+
+def make_sensor(accel_fs, gyro_fs, dlpf):
+    bus = sim.SimBus()
+    bus.attach(sim.MPU6050Model(sim.rotating(90)))
+    sim.use_clock(bus)
+    mpu = mpu6050.MPU6050(bus)
+    mpu.set_accel_fullscale(accel_fs)
+    mpu.set_gyro_fullscale(gyro_fs)
+    mpu.set_dlpf_mode(dlpf)
+    mpu.set_sample_rate(1000)
+    return bus, mpu
+
+
+def direct_paths(mpu):
+    values = [0.0] * 7
+    raw = [0] * 7
+    return [
+        ('get_values', lambda: mpu.get_values()),
+        ('get_accel_values', lambda: mpu.get_accel_values()),
+        ('get_gyro_values', lambda: mpu.get_gyro_values()),
+        ('get_temp', lambda: mpu.get_temp()),
+        ('read_raw', lambda: mpu.read_raw(raw)),
+        ('get_values_into', lambda: mpu.get_values_into(values)),
+    ]
+
+
+def driver_alloc(fn, calls):
+    # memory allocated by the driver code, kept alive by holding the results
+    filters = [tracemalloc.Filter(True, mpu6050.__file__)]
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(filters)
+    for i in range(calls):
+        kept.append(fn())
+    after = tracemalloc.take_snapshot().filter_traces(filters)
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+
+def measure(bus, fn, n, samples_per_call=1):
+    # fn returns a list [samples, result]
+    # warm up, then account bus traffic and host time
+    fn()
+    bus.reset_stats()
+    samples = 0
+    t0 = time.perf_counter()
+    for i in range(n):
+        samples += fn()[0]
+    elapsed = time.perf_counter() - t0
+    stats = bus.stats()
+
+    calls = min(n, 50)
+    alloc = driver_alloc(fn, calls)
+
+    samples = max(samples, 1)
+    return {
+        'samples': samples,
+        'host_samples_per_s': samples / elapsed if elapsed > 0 else None,
+        'transactions_per_sample': stats['transactions'] / samples,
+        'bytes_per_sample': (stats['bytes_read'] + stats['bytes_written']) / samples,
+        'bus_time_us_per_sample': stats['bus_time_us'] / samples,
+        'bus_samples_per_s': samples * 1000000 / stats['bus_time_us'] if stats['bus_time_us'] else None,
+        'alloc_bytes_per_call': alloc / calls,
+        'samples_per_call': samples_per_call,
+    }
+
+
+def bench_direct(accel_fs, gyro_fs, dlpf, n):
+    results = []
+    bus, mpu = make_sensor(accel_fs, gyro_fs, dlpf)
+    for name, path in direct_paths(mpu):
+        def fn(path=path):
+            return [1, path()]
+        res = measure(bus, fn, n)
+        res['path'] = name
+        results.append(res)
+    return results
+
+
+def bench_fifo(accel_fs, gyro_fs, dlpf, n):
+    bus, mpu = make_sensor(accel_fs, gyro_fs, dlpf)
+    mpu.set_fifo_channels(True, True, True)
+    mpu.enable_fifo(True)
+    buf = bytearray(mpu.get_fifo_frame_size() * FIFO_BATCH * 2)
+    period_us = FIFO_BATCH * 1000000 / mpu.get_sample_rate()
+
+    def drain():
+        bus.advance(period_us)
+        return [mpu.read_fifo(buf), None]
+
+    def drain_decoded():
+        bus.advance(period_us)
+        frames = list(mpu.fifo_values(buf))
+        return [len(frames), frames]
+
+    results = []
+    calls = max(n // FIFO_BATCH, 1)
+    for name, fn in (('read_fifo', drain), ('fifo_values', drain_decoded)):
+        # idle time between drains is simulated time, not bus traffic
+        res = measure(bus, fn, calls, FIFO_BATCH)
+        res['path'] = name
+        results.append(res)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MPU6050 driver benchmarks on the simulated bus')
+    parser.add_argument('-n', type=int, default=200, help='samples per measurement')
+    parser.add_argument('-o', '--output', default=None, help='JSON output file (default: stdout)')
+    args = parser.parse_args()
+
+    results = []
+    for accel_fs in ACCEL_FULLSCALES:
+        for gyro_fs in GYRO_FULLSCALES:
+            for dlpf in DLPF_MODES:
+                config = {
+                    'accel_fullscale': accel_fs,
+                    'gyro_fullscale': gyro_fs,
+                    'dlpf': dlpf,
+                }
+                for res in bench_direct(accel_fs, gyro_fs, dlpf, args.n):
+                    res.update(config)
+                    results.append(res)
+                for res in bench_fifo(accel_fs, gyro_fs, dlpf, args.n):
+                    res.update(config)
+                    results.append(res)
+
+    report = {
+        'python': platform.python_version(),
+        'samples': args.n,
+        'results': results,
+    }
+    out = json.dumps(report, indent=2)
+    if args.output is None:
+        print(out)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(out)
+
+
+if __name__ == '__main__':
+    main()
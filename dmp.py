@@ -0,0 +1,279 @@
+# Zerynth - libs - invensense-mpu6050/dmp.py
+#
+# Zerynth library for the MPU6050 Digital Motion Processor
+#
+# @Date: 2026-10-16
+
+"""
+.. module:: dmp
+
+**********
+DMP Module
+**********
+
+This module contains the support for the Digital Motion Processor (DMP) of the MPU6050: firmware upload with
+read-back verification, DMP enable and a FIFO packet parser yielding quaternions, gravity vectors and gesture events.
+With the DMP running, the sensor fusion runs on the chip and the host only drains the FIFO.
+
+The DMP firmware image is distributed by InvenSense (e.g. within the MotionApps libraries) and is not included
+in this library: it must be supplied as a bytes object, together with the program start address and the
+configuration updates required by that firmware (see :meth:`DMP.write_memory`).
+
+The default packet layout is the one of the MotionApps 2.0 firmware (42 bytes, quaternion in the first 16 bytes).
+
+"""
+
+# DMP registers
+REG_BANK_SEL = 0x6D
+REG_MEM_START_ADDR = 0x6E
+REG_MEM_R_W = 0x6F
+REG_DMP_CFG_1 = 0x70
+REG_DMP_CFG_2 = 0x71
+REG_USER_CTRL = 0x6A
+REG_INT_ENABLE = 0x38
+
+# DMP values
+DMP_BANK_SIZE = 256
+DMP_CHUNK_SIZE = 16
+DMP_START_ADDRESS = 0x0400
+DMP_PACKET_SIZE = 42
+
+# signed 32-bit big endian value at position ofs of buf
+def _s32(buf, ofs):
+    v = (buf[ofs] << 24) | (buf[ofs + 1] << 16) | (buf[ofs + 2] << 8) | buf[ofs + 3]
+    if (v > 0x7FFFFFFF):
+        v -= 0x100000000
+    return v
+
+
+class DMP():
+    """
+
+===========
+ DMP class
+===========
+
+.. class:: DMP(sensor, packet_size=42, gesture_parser=None)
+
+    Creates the DMP interface of *sensor*, an :class:`MPU6050` instance.
+
+    :param sensor: the sensor hosting the DMP
+    :param packet_size: size in bytes of the packets written by the firmware into the FIFO, default 42 (MotionApps 2.0)
+    :param gesture_parser: function called as ``gesture_parser(buf, ofs)`` for every packet, returning the gesture event
+                           decoded from the packet at offset *ofs* of *buf*, or None. Gesture events are firmware
+                           specific, so they are not decoded when None (default).
+
+    ::
+
+        from invensense.mpu6050 import mpu6050
+        from invensense.mpu6050 import dmp
+
+        ...
+
+        mpu = mpu6050.MPU6050(I2C0)
+        proc = dmp.DMP(mpu)
+        proc.load_firmware(FIRMWARE)
+        proc.enable(True)
+
+        buf = bytearray(420)
+        while True:
+            for quat, gravity, gesture in proc.packets(buf):
+                print(quat, gravity)
+            sleep(100)
+
+    """
+
+    def __init__(self, sensor, packet_size=DMP_PACKET_SIZE, gesture_parser=None):
+        if (packet_size < 16):
+            raise ValueError
+
+        self.sensor = sensor
+        self.packet_size = packet_size
+        self.gesture_parser = gesture_parser
+
+    ##
+    ## @brief      Select the DMP memory bank and the start address with a single transaction.
+    ##
+    ## @param      self
+    ## @param      bank     is the memory bank.
+    ## @param      addr     is the address inside the bank.
+    ## @return     nothing
+    ##
+    def _set_memory_address(self, bank, addr):
+        # BANK_SEL and MEM_START_ADDR are consecutive
+        self.sensor.write_bytes(REG_BANK_SEL, bank, addr)
+
+    def write_memory(self, bank, addr, data):
+        """
+    .. method:: write_memory(bank, addr, data)
+
+        :param bank: is the DMP memory bank.
+        :param addr: is the address inside the bank.
+        :param data: is the data to write. It must not cross the end of the bank.
+
+        Write *data* in the DMP memory.
+
+        """
+        if (addr + len(data) > DMP_BANK_SIZE):
+            raise ValueError
+
+        self._set_memory_address(bank, addr)
+        self.sensor.write_bytes(REG_MEM_R_W, *data)
+
+    def read_memory(self, bank, addr, n):
+        """
+    .. method:: read_memory(bank, addr, n)
+
+        :param bank: is the DMP memory bank.
+        :param addr: is the address inside the bank.
+        :param n: is the number of bytes to read. They must not cross the end of the bank.
+
+        Return *n* bytes read from the DMP memory.
+
+        """
+        if (addr + n > DMP_BANK_SIZE):
+            raise ValueError
+
+        self._set_memory_address(bank, addr)
+        return self.sensor.write_read(REG_MEM_R_W, n=n)
+
+    def load_firmware(self, image, start_address=DMP_START_ADDRESS, chunk=DMP_CHUNK_SIZE, verify=True):
+        """
+    .. method:: load_firmware(image, start_address=0x0400, chunk=16, verify=True)
+
+        :param image: is the DMP firmware image.
+        :param start_address: is the program start address of the firmware.
+        :param chunk: is the number of bytes written with each transaction.
+        :param verify: if True, every chunk is read back and compared with the image.
+
+        Upload the firmware image in the DMP memory, in chunks that never cross a memory bank, and set the program
+        start address (DMP_CFG_1 and DMP_CFG_2 registers). The DMP must be disabled.
+
+        Raise ``PeripheralError`` when a chunk read back does not match the image.
+
+        """
+        if (chunk <= 0 or chunk > DMP_BANK_SIZE):
+            raise ValueError
+
+        ofs = 0
+        size = len(image)
+        while ofs < size:
+            bank = ofs // DMP_BANK_SIZE
+            addr = ofs % DMP_BANK_SIZE
+            n = chunk
+            if (addr + n > DMP_BANK_SIZE):
+                n = DMP_BANK_SIZE - addr
+            if (ofs + n > size):
+                n = size - ofs
+
+            data = image[ofs:ofs + n]
+            self.write_memory(bank, addr, data)
+            if (verify):
+                if (self.read_memory(bank, addr, n) != bytes(data)):
+                    raise PeripheralError
+            ofs += n
+
+        # DMP_CFG_1 and DMP_CFG_2 are consecutive
+        self.sensor.write_bytes(REG_DMP_CFG_1, (start_address >> 8) & 0xFF, start_address & 0xFF)
+
+    def enable(self, state, interrupt=False):
+        """
+    .. method:: enable(state, interrupt=False)
+
+        :param state: if True, the DMP and its FIFO output are reset and enabled, otherwise the DMP is disabled.
+        :param interrupt: if True, the DMP interrupt (DMP_INT_EN bit of INT_ENABLE register) is enabled too.
+
+        Enable or disable the DMP. When enabled, the FIFO holds only DMP packets: the raw channels selected with
+        :meth:`MPU6050.set_fifo_channels` are disabled.
+
+        """
+        if (state != True and state != False):
+            raise ValueError
+        if (interrupt != True and interrupt != False):
+            raise ValueError
+
+        sensor = self.sensor
+        if (state):
+            sensor.set_fifo_channels(False, False, False)
+            # FIFO frames are DMP packets: the FIFO reader drains whole packets and resynchronizes on overflow
+            sensor.set_fifo_frame_size(self.packet_size)
+            # DMP_RESET works only while DMP_EN is 0
+            value = sensor.write_read(REG_USER_CTRL, n=1)[0]
+            value &= ~((1 << 7) | (1 << 3))
+            sensor.write_bytes(REG_USER_CTRL, value)
+            sensor.write_bytes(REG_USER_CTRL, value | (1 << 3))
+            # FIFO reset and enable, stale overflow flag included
+            sensor.enable_fifo(True)
+            sensor.write_register_bit(REG_USER_CTRL, 7, True)
+            sensor.write_register_bit(REG_INT_ENABLE, 1, interrupt)
+        else:
+            value = sensor.write_read(REG_USER_CTRL, n=1)[0]
+            value &= ~((1 << 7) | (1 << 6))
+            sensor.write_bytes(REG_USER_CTRL, value)
+            sensor.write_register_bit(REG_INT_ENABLE, 1, False)
+            sensor.set_fifo_frame_size(0)
+
+    def parse_quaternion(self, buf, ofs=0):
+        """
+    .. method:: parse_quaternion(buf, ofs=0)
+
+        Return the quaternion [w, x, y, z] of the packet at offset *ofs* of *buf* (four signed 32-bit values in Q30 format).
+
+        """
+        return [
+            _s32(buf, ofs) / 1073741824,
+            _s32(buf, ofs + 4) / 1073741824,
+            _s32(buf, ofs + 8) / 1073741824,
+            _s32(buf, ofs + 12) / 1073741824
+        ]
+
+    def get_gravity(self, quat):
+        """
+    .. method:: get_gravity(quat)
+
+        Return the gravity direction [x, y, z] in the sensor frame (in g) computed from the quaternion *quat*.
+
+        """
+        w = quat[0]
+        x = quat[1]
+        y = quat[2]
+        z = quat[3]
+        return [
+            2 * (x * z - w * y),
+            2 * (w * x + y * z),
+            w * w - x * x - y * y + z * z
+        ]
+
+    def read_packets(self, buf):
+        """
+    .. method:: read_packets(buf)
+
+        :param buf: is a bytearray where the DMP packets are stored.
+
+        Drain as many whole packets as fit in *buf* from the FIFO (see :meth:`MPU6050.read_fifo`, overflow
+        recovery included). Return the number of packets stored in *buf*.
+
+        """
+        return self.sensor.read_fifo(buf)
+
+    def packets(self, buf):
+        """
+    .. method:: packets(buf)
+
+        :param buf: is a bytearray used to drain the FIFO (see :meth:`read_packets`).
+
+        Drain the FIFO once and yield, for each DMP packet, a list [quat, gravity, gesture] where quat is the
+        quaternion [w, x, y, z], gravity the gravity direction [x, y, z] and gesture the event returned by the
+        gesture parser (None when there is no gesture parser or no event).
+
+        """
+        n = self.read_packets(buf)
+        size = self.packet_size
+        parser = self.gesture_parser
+        for i in range(n):
+            ofs = i * size
+            quat = self.parse_quaternion(buf, ofs)
+            gesture = None
+            if (parser is not None):
+                gesture = parser(buf, ofs)
+            yield [quat, self.get_gravity(quat), gesture]
@@ -0,0 +1,34 @@
+################################################################################
+# Interrupt Driven Sensor Example
+#
+# Created: 2026-10-16
+#
+################################################################################
+
+import streams
+from invensense.mpu6050 import mpu6050
+
+streams.serial()
+
+def print_values(values):
+    temp, acc, gyro = values
+    print("Temperature: ", temp, "C")
+    print("Accelerometer: ", acc)
+    print("Gyroscope: ", gyro)
+    print("--------------------------------------------------------")
+
+try:
+    # Setup sensor 
+    print("start...")
+    mpu = mpu6050.MPU6050(I2C0)
+    print("Ready!")
+    print("--------------------------------------------------------")
+    # 10 Hz output rate, data registers are read only when INT pin rises
+    mpu.set_dlpf_mode(1)
+    mpu.set_sample_rate(10)
+    mpu.on_data_ready(D2, print_values)
+except Exception as e:
+    print("Error: ",e)
+
+while True:
+    sleep(1000)
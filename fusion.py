@@ -0,0 +1,361 @@
+# Zerynth - libs - invensense-mpu6050/fusion.py
+#
+# Zerynth library for MPU6050 quaternion sensor fusion
+#
+# @Date: 2026-10-16
+
+"""
+.. module:: fusion
+
+*************
+Fusion Module
+*************
+
+This module contains the Madgwick and Mahony attitude filters for the samples of the MPU6050 driver.
+Both fuse accelerometer and gyroscope (6 axes, no magnetometer, so the heading drifts) into a unit quaternion,
+also available as Euler angles.
+
+The filters work directly on raw counts, either one sample at a time (see :meth:`MPU6050.read_raw`) or on a block
+of frames drained from the FIFO (see :meth:`MPU6050.read_fifo`), without creating objects for each sample.
+
+"""
+
+import math
+
+
+class _Fusion():
+
+    def __init__(self, sensor):
+        self.sensor = sensor
+        self._raw = [0, 0, 0, 0, 0, 0, 0]
+        self.set_dt(1 / sensor.get_sample_rate())
+        self.reset()
+
+    def set_dt(self, dt):
+        """
+    .. method:: set_dt(dt)
+
+        :param dt: is the sample period in seconds.
+
+        Set the sample period used when no dt is given to the update methods and refresh the gyroscope scale from the sensor.
+
+        """
+        if (dt <= 0):
+            raise ValueError
+
+        self.dt = dt
+        # raw counts to rad/s
+        self._gyro_scale = math.radians(self.sensor.get_gyro_scale())
+
+    def reset(self):
+        """
+    .. method:: reset()
+
+        Reset the attitude to the identity quaternion.
+
+        """
+        self.q0 = 1.0
+        self.q1 = 0.0
+        self.q2 = 0.0
+        self.q3 = 0.0
+
+    def update(self, raw, dt=None):
+        """
+    .. method:: update(raw, dt=None)
+
+        :param raw: is the list of the seven raw counts of a sample (see :meth:`MPU6050.read_raw`).
+        :param dt: is the time elapsed since the previous sample, in seconds. If None, the sample period is used.
+
+        Update the attitude with a sample.
+
+        """
+        if (dt is None):
+            dt = self.dt
+        k = self._gyro_scale
+        self._update(raw[0], raw[1], raw[2], raw[4] * k, raw[5] * k, raw[6] * k, dt)
+
+    def update_block(self, samples, n, dt=None):
+        """
+    .. method:: update_block(samples, n, dt=None)
+
+        :param samples: is a flat sequence of raw counts, 7 for each sample in the order of :meth:`MPU6050.read_raw`.
+        :param n: is the number of samples in *samples*.
+        :param dt: is the time between two samples, in seconds. If None, the sample period is used.
+
+        Update the attitude with a block of raw samples.
+
+        """
+        if (dt is None):
+            dt = self.dt
+        k = self._gyro_scale
+        ofs = 0
+        for i in range(n):
+            self._update(samples[ofs], samples[ofs + 1], samples[ofs + 2],
+                         samples[ofs + 4] * k, samples[ofs + 5] * k, samples[ofs + 6] * k, dt)
+            ofs += 7
+
+    def update_fifo(self, buf, frames, dt=None):
+        """
+    .. method:: update_fifo(buf, frames, dt=None)
+
+        :param buf: is the buffer filled by :meth:`MPU6050.read_fifo`.
+        :param frames: is the number of frames stored in *buf*.
+        :param dt: is the time between two frames, in seconds. If None, the sample period is used.
+
+        Update the attitude with a block of FIFO frames, decoding the raw counts straight from *buf*.
+        Both accelerometer and gyroscope must be written into the FIFO (see :meth:`MPU6050.set_fifo_channels`).
+
+        """
+        sensor = self.sensor
+        accel, temp, gyro = sensor.get_fifo_channels()
+        if (not accel or not gyro):
+            raise ValueError
+        if (dt is None):
+            dt = self.dt
+
+        raw = self._raw
+        frame_size = sensor.get_fifo_frame_size()
+        ofs = 0
+        for i in range(frames):
+            self.update(sensor.decode_fifo_raw(buf, ofs, raw), dt)
+            ofs += frame_size
+
+    def get_quaternion(self):
+        """
+    .. method:: get_quaternion()
+
+        Return the attitude quaternion in a list [w, x, y, z].
+
+        """
+        return [self.q0, self.q1, self.q2, self.q3]
+
+    def get_euler(self):
+        """
+    .. method:: get_euler()
+
+        Return the attitude as Euler angles in a list [roll, pitch, yaw], in degrees.
+
+        """
+        q0 = self.q0
+        q1 = self.q1
+        q2 = self.q2
+        q3 = self.q3
+        roll = math.atan2(2 * (q0 * q1 + q2 * q3), 1 - 2 * (q1 * q1 + q2 * q2))
+        s = 2 * (q0 * q2 - q3 * q1)
+        if (s > 1):
+            s = 1
+        elif (s < -1):
+            s = -1
+        pitch = math.asin(s)
+        yaw = math.atan2(2 * (q0 * q3 + q1 * q2), 1 - 2 * (q2 * q2 + q3 * q3))
+        return [math.degrees(roll), math.degrees(pitch), math.degrees(yaw)]
+
+
+class Madgwick(_Fusion):
+    """
+
+================
+ Madgwick class
+================
+
+.. class:: Madgwick(sensor, beta=0.1)
+
+    Creates a Madgwick gradient descent attitude filter for the samples of *sensor*, an :class:`MPU6050` instance.
+
+    :param sensor: the sensor providing the samples, used for the gyroscope scale and the sample rate
+    :param beta: filter gain, default 0.1
+
+    The sample period is read from the sensor when the filter is created: call :meth:`set_dt` after changing the
+    sample rate or the gyroscope full-scale range. ::
+
+        from invensense.mpu6050 import mpu6050
+        from invensense.mpu6050 import fusion
+
+        ...
+
+        mpu = mpu6050.MPU6050(I2C0)
+        mpu.set_sample_rate(200)
+        mpu.set_fifo_channels(accel=True, gyro=True)
+        mpu.enable_fifo(True)
+
+        ahrs = fusion.Madgwick(mpu)
+        buf = bytearray(600)
+        while True:
+            ahrs.update_fifo(buf, mpu.read_fifo(buf))
+            print(ahrs.get_euler())
+            sleep(200)
+
+    """
+
+    def __init__(self, sensor, beta=0.1):
+        if (beta < 0):
+            raise ValueError
+
+        self.beta = beta
+        _Fusion.__init__(self, sensor)
+
+    ##
+    ## @brief      Update the quaternion with a sample.
+    ##
+    ## @param      self
+    ## @param      ax, ay, az   accelerometer values, in any unit (they are normalized).
+    ## @param      gx, gy, gz   gyroscope values, in rad/s.
+    ## @param      dt           time elapsed since the previous sample, in seconds.
+    ## @return     nothing
+    ##
+    def _update(self, ax, ay, az, gx, gy, gz, dt):
+        q0 = self.q0
+        q1 = self.q1
+        q2 = self.q2
+        q3 = self.q3
+
+        # rate of change of quaternion from gyroscope
+        qd0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        qd1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        qd2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        qd3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+
+        norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if (norm > 0):
+            ax /= norm
+            ay /= norm
+            az /= norm
+
+            # gradient descent corrective step
+            _2q0 = 2 * q0
+            _2q1 = 2 * q1
+            _2q2 = 2 * q2
+            _2q3 = 2 * q3
+            _4q0 = 4 * q0
+            _4q1 = 4 * q1
+            _4q2 = 4 * q2
+            _8q1 = 8 * q1
+            _8q2 = 8 * q2
+            q0q0 = q0 * q0
+            q1q1 = q1 * q1
+            q2q2 = q2 * q2
+            q3q3 = q3 * q3
+
+            s0 = _4q0 * q2q2 + _2q2 * ax + _4q0 * q1q1 - _2q1 * ay
+            s1 = _4q1 * q3q3 - _2q3 * ax + 4 * q0q0 * q1 - _2q0 * ay - _4q1 + _8q1 * q1q1 + _8q1 * q2q2 + _4q1 * az
+            s2 = 4 * q0q0 * q2 + _2q0 * ax + _4q2 * q3q3 - _2q3 * ay - _4q2 + _8q2 * q1q1 + _8q2 * q2q2 + _4q2 * az
+            s3 = 4 * q1q1 * q3 - _2q1 * ax + 4 * q2q2 * q3 - _2q2 * ay
+
+            norm = math.sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if (norm > 0):
+                beta = self.beta / norm
+                qd0 -= beta * s0
+                qd1 -= beta * s1
+                qd2 -= beta * s2
+                qd3 -= beta * s3
+
+        q0 += qd0 * dt
+        q1 += qd1 * dt
+        q2 += qd2 * dt
+        q3 += qd3 * dt
+
+        norm = math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        self.q0 = q0 / norm
+        self.q1 = q1 / norm
+        self.q2 = q2 / norm
+        self.q3 = q3 / norm
+
+
+class Mahony(_Fusion):
+    """
+
+==============
+ Mahony class
+==============
+
+.. class:: Mahony(sensor, kp=1.0, ki=0.0)
+
+    Creates a Mahony complementary attitude filter for the samples of *sensor*, an :class:`MPU6050` instance.
+
+    :param sensor: the sensor providing the samples, used for the gyroscope scale and the sample rate
+    :param kp: proportional gain, default 1.0
+    :param ki: integral gain (gyroscope bias estimation), default 0.0
+
+    It has the same interface as :class:`Madgwick`.
+
+    """
+
+    def __init__(self, sensor, kp=1.0, ki=0.0):
+        if (kp < 0 or ki < 0):
+            raise ValueError
+
+        self.kp = kp
+        self.ki = ki
+        _Fusion.__init__(self, sensor)
+
+    def reset(self):
+        """
+    .. method:: reset()
+
+        Reset the attitude to the identity quaternion and clear the integral feedback.
+
+        """
+        _Fusion.reset(self)
+        self._ix = 0.0
+        self._iy = 0.0
+        self._iz = 0.0
+
+    ##
+    ## @brief      Update the quaternion with a sample.
+    ##
+    ## @param      self
+    ## @param      ax, ay, az   accelerometer values, in any unit (they are normalized).
+    ## @param      gx, gy, gz   gyroscope values, in rad/s.
+    ## @param      dt           time elapsed since the previous sample, in seconds.
+    ## @return     nothing
+    ##
+    def _update(self, ax, ay, az, gx, gy, gz, dt):
+        q0 = self.q0
+        q1 = self.q1
+        q2 = self.q2
+        q3 = self.q3
+
+        norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if (norm > 0):
+            ax /= norm
+            ay /= norm
+            az /= norm
+
+            # estimated direction of gravity (halved)
+            vx = q1 * q3 - q0 * q2
+            vy = q0 * q1 + q2 * q3
+            vz = q0 * q0 - 0.5 + q3 * q3
+
+            # error between estimated and measured direction of gravity (halved)
+            ex = ay * vz - az * vy
+            ey = az * vx - ax * vz
+            ez = ax * vy - ay * vx
+
+            if (self.ki > 0):
+                self._ix += 2 * self.ki * ex * dt
+                self._iy += 2 * self.ki * ey * dt
+                self._iz += 2 * self.ki * ez * dt
+                gx += self._ix
+                gy += self._iy
+                gz += self._iz
+
+            gx += 2 * self.kp * ex
+            gy += 2 * self.kp * ey
+            gz += 2 * self.kp * ez
+
+        gx *= 0.5 * dt
+        gy *= 0.5 * dt
+        gz *= 0.5 * dt
+        qa = q0
+        qb = q1
+        qc = q2
+        q0 += -qb * gx - qc * gy - q3 * gz
+        q1 += qa * gx + qc * gz - q3 * gy
+        q2 += qa * gy - qb * gz + q3 * gx
+        q3 += qa * gz + qb * gy - qc * gx
+
+        norm = math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        self.q0 = q0 / norm
+        self.q1 = q1 / norm
+        self.q2 = q2 / norm
+        self.q3 = q3 / norm
@@ -0,0 +1,267 @@
+# Zerynth - libs - invensense-mpu6050/manager.py
+#
+# Zerynth library for groups of MPU6050 motion sensors
+#
+# @Date: 2026-10-16
+
+"""
+.. module:: manager
+
+**************
+Manager Module
+**************
+
+This module contains a manager for several MPU6050 sensors, on one or more I2C buses (up to two sensors per bus,
+at addresses 0x68 and 0x69). It schedules the reads of the whole group so that the samples of the different
+sensors are taken as close as possible in time, and shares a single FIFO drain schedule across all of them.
+
+"""
+
+import timers
+
+
+class MPU6050Group():
+    """
+
+====================
+ MPU6050Group class
+====================
+
+.. class:: MPU6050Group(sensors=None)
+
+    Creates a group of MPU6050 sensors.
+
+    :param sensors: list of :class:`MPU6050` instances, default None (empty group)
+
+    Samples of the whole group can be read with a single call: ::
+
+        from invensense.mpu6050 import mpu6050
+        from invensense.mpu6050 import manager
+
+        ...
+
+        group = manager.MPU6050Group([mpu6050.MPU6050(I2C0, 0x68), mpu6050.MPU6050(I2C0, 0x69), mpu6050.MPU6050(I2C1)])
+
+        t, skew, values = group.read_all()
+
+    """
+
+    def __init__(self, sensors=None):
+        self.sensors = []
+        self._raw = []
+        if (sensors is not None):
+            for sensor in sensors:
+                self.add(sensor)
+        # next sensor checked by read_ready
+        self._next = 0
+
+    def add(self, sensor):
+        """
+    .. method:: add(sensor)
+
+        :param sensor: is the :class:`MPU6050` instance to add.
+
+        Add a sensor to the group.
+
+        """
+        self.sensors.append(sensor)
+        self._raw.append([0, 0, 0, 0, 0, 0, 0])
+
+    def configure(self, clock=None, accel_fullscale=None, gyro_fullscale=None, dlpf=None, dhpf=None, sample_rate=None, sleep=None):
+        """
+    .. method:: configure(clock=None, accel_fullscale=None, gyro_fullscale=None, dlpf=None, dhpf=None, sample_rate=None, sleep=None)
+
+        Apply the same settings to every sensor of the group (see :meth:`MPU6050.configure`).
+
+        """
+        for sensor in self.sensors:
+            sensor.configure(clock, accel_fullscale, gyro_fullscale, dlpf, dhpf, sample_rate, sleep)
+
+    ##
+    ## @brief      Convert the raw counts of a sensor into the values of temperature, accelerometer and gyroscope.
+    ##
+    ## @param      self
+    ## @param      sensor   is the sensor the counts were read from.
+    ## @param      raw      is the list of the seven raw counts (see MPU6050.read_raw).
+    ## @param      g        is the format of accelerometer values (see MPU6050.get_values).
+    ## @return     a list [temp, accel, gyro], temp is None when the temperature sensor is off.
+    ##
+    def _convert(self, sensor, raw, g):
+        accel_scale = sensor.get_accel_scale(g)
+        gyro_scale = sensor.get_gyro_scale()
+        temp = None
+        if (sensor.get_active_axes()[2] and not sensor.is_low_power()):
+            temp = (raw[3] / 340) + 36.53
+        return [
+            temp,
+            {'x': raw[0] * accel_scale, 'y': raw[1] * accel_scale, 'z': raw[2] * accel_scale},
+            {'x': raw[4] * gyro_scale, 'y': raw[5] * gyro_scale, 'z': raw[6] * gyro_scale}
+        ]
+
+    def read_all(self, g=False):
+        """
+    .. method:: read_all(g=False)
+
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Read every sensor of the group, round-robin. The raw samples are read back to back with a single burst each
+        and converted only afterwards, to keep the samples as close as possible in time.
+
+        Return a list [t, skew, values], where t is the time (in milliseconds, see ``timers.now()``) of the first read,
+        skew the time elapsed between the first and the last read and values the list of [temp, accel, gyro]
+        of each sensor, in the order of the group (temp is None when the temperature sensor is off, see :meth:`MPU6050.get_values`).
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        t0 = timers.now()
+        for i in range(len(self.sensors)):
+            self.sensors[i].read_raw(self._raw[i])
+        t1 = timers.now()
+
+        values = []
+        for i in range(len(self.sensors)):
+            values.append(self._convert(self.sensors[i], self._raw[i], g))
+
+        return [t0, t1 - t0, values]
+
+    def read_ready(self, g=False):
+        """
+    .. method:: read_ready(g=False)
+
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Check the data ready flag of every sensor, starting from the one following the last sensor checked,
+        and read only the sensors with new data.
+
+        Return a list [t, values] where t is the time (in milliseconds) of the check and values has, for each sensor
+        in the order of the group, a list [temp, accel, gyro] or None when no new data was ready.
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        n = len(self.sensors)
+        values = [None] * n
+        t = timers.now()
+        for k in range(n):
+            i = (self._next + k) % n
+            sensor = self.sensors[i]
+            if (sensor.is_data_ready()):
+                values[i] = self._convert(sensor, sensor.read_raw(self._raw[i]), g)
+        if (n):
+            self._next = (self._next + 1) % n
+
+        return [t, values]
+
+    def start_fifo(self, accel=True, temp=False, gyro=True):
+        """
+    .. method:: start_fifo(accel=True, temp=False, gyro=True)
+
+        Select the same FIFO channels on every sensor (see :meth:`MPU6050.set_fifo_channels`) and then enable all the FIFOs
+        back to back, so that frames with the same index in the different FIFOs are as close as possible in time.
+        The sensors should be set to the same sample rate.
+
+        """
+        for sensor in self.sensors:
+            sensor.set_fifo_channels(accel, temp, gyro)
+        for sensor in self.sensors:
+            sensor.enable_fifo(True)
+
+    def stop_fifo(self):
+        """
+    .. method:: stop_fifo()
+
+        Disable the FIFO of every sensor.
+
+        """
+        for sensor in self.sensors:
+            sensor.enable_fifo(False)
+
+    def drain_fifo(self, bufs):
+        """
+    .. method:: drain_fifo(bufs)
+
+        :param bufs: is a list of bytearrays, one for each sensor, where the FIFO frames are stored.
+
+        Drain the FIFOs of the whole group with a shared schedule: the same number of frames (the lowest available
+        among the sensors) is read from every FIFO, so that the frames stored at the same position in *bufs* are
+        aligned in time. Frames left in a FIFO are read by the next drain.
+
+        When a FIFO overflows (see :meth:`MPU6050.get_fifo_gap`) the alignment with the other sensors is lost:
+        the overflow flags of all the sensors are checked and cleared, every FIFO is restarted and no frame is returned.
+        The frames discarded by the restart are reported by :meth:`MPU6050.get_fifo_gap` of each sensor.
+
+        Return the number of frames stored in each buffer.
+
+        """
+        n = len(self.sensors)
+        if (len(bufs) != n):
+            raise ValueError
+
+        # check every flag, so that no stale overflow triggers a second restart
+        overflows = []
+        for sensor in self.sensors:
+            overflows.append(sensor.check_fifo_overflow())
+
+        if (True in overflows):
+            # frames discarded by the restart: the overflowed FIFOs lost at least one frame
+            dropped = []
+            for i in range(n):
+                sensor = self.sensors[i]
+                lost = sensor.get_fifo_count() // sensor.get_fifo_frame_size()
+                if (overflows[i] and lost == 0):
+                    lost = 1
+                dropped.append(lost)
+            # restart every FIFO back to back to realign the group
+            for sensor in self.sensors:
+                sensor.enable_fifo(True)
+            for i in range(n):
+                self.sensors[i].add_fifo_gap(dropped[i])
+            return 0
+
+        frames = -1
+        for i in range(n):
+            sensor = self.sensors[i]
+            available = sensor.get_fifo_count() // sensor.get_fifo_frame_size()
+            capacity = len(bufs[i]) // sensor.get_fifo_frame_size()
+            if (capacity < available):
+                available = capacity
+            if (frames < 0 or available < frames):
+                frames = available
+
+        if (frames <= 0):
+            return 0
+        for i in range(n):
+            sensor = self.sensors[i]
+            sensor.read_fifo(bufs[i], frames * sensor.get_fifo_frame_size())
+        return frames
+
+    def fifo_values(self, bufs, g=False):
+        """
+    .. method:: fifo_values(bufs, g=False)
+
+        :param bufs: is a list of bytearrays, one for each sensor (see :meth:`drain_fifo`).
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Drain the FIFOs of the group and yield, for each frame, the list of the decoded frames of every sensor
+        (each one a list [temp, accel, gyro] like :meth:`MPU6050.fifo_values`).
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        frames = self.drain_fifo(bufs)
+        for k in range(frames):
+            values = []
+            for i in range(len(self.sensors)):
+                sensor = self.sensors[i]
+                values.append(sensor.decode_fifo_frame(bufs[i], k * sensor.get_fifo_frame_size(), g))
+            yield values
@@ -30,6 +30,7 @@ Additional features include an embedded temperature sensor.
 """
 
 import i2c
+import timers
 
 GRAVITIY_MS2 = 9.80665
 
@@ -44,6 +45,30 @@ def _tc(v, n_bit=16):
     mask = 2**(n_bit - 1)
     return -(v & mask) + (v & ~mask)
 
+# round to the nearest integer, halves away from zero
+#
+# @param      v      value to be rounded
+#
+# @return     the nearest integer to v
+#
+def _round(v):
+    if (v < 0):
+        return -int(-v + 0.5)
+    return int(v + 0.5)
+
+# clamp to the signed 16-bit range
+#
+# @param      v      integer value to be clamped
+#
+# @return     v limited to -32768..32767
+#
+def _clamp16(v):
+    if (v < -32768):
+        return -32768
+    if (v > 32767):
+        return 32767
+    return v
+
 # Define some constants from the datasheet
 
 MPU6050_ADDRESS = 0x68 # 0x69 when AD0 pin to Vcc
@@ -84,8 +109,21 @@ GYRO_ZOUT0 = 0x47
 GYRO_ZOUT1 = 0x48
 
 REG_CONFIG = 0x1A
+REG_SMPLRT_DIV = 0x19
+
+# Offset registers
+XA_OFFS_H = 0x06 # XA_OFFS_H..ZA_OFFS_L_TC, +-16g format, bit 0 of the low byte is reserved
+XG_OFFS_USRH = 0x13 # XG_OFFS_USRH..ZG_OFFS_USRL, +-1000dps format
+ACCEL_OFFS_SENSITIVITY = 2048.0
+GYRO_OFFS_SENSITIVITY = 32.8
+
+# Calibration profile
+PROFILE_MAGIC = 0x68
+PROFILE_VERSION = 1
+PROFILE_SIZE = 20
 
 # Motion register
+REG_INT_PIN_CFG = 0x37
 REG_INT_ENABLE = 0x38
 REG_INT_STATUS = 0x3A
 REG_MOT_DETECT_CTRL = 0x69
@@ -95,6 +133,43 @@ REG_MOT_DURATION = 0x20
 REG_ZMOT_THRESHOLD = 0x21
 REG_ZMOT_DURATION = 0x22
 
+# Interrupt events (INT_STATUS bits)
+EVENT_DATA_READY = 0x01
+EVENT_DMP = 0x02
+EVENT_I2C_MASTER = 0x08
+EVENT_FIFO_OVERFLOW = 0x10
+EVENT_ZERO_MOTION = 0x20
+EVENT_MOTION = 0x40
+EVENT_FREE_FALL = 0x80
+
+# Motion detection status (MOT_DETECT_STATUS bits)
+MOT_X_NEG = 0x80
+MOT_X_POS = 0x40
+MOT_Y_NEG = 0x20
+MOT_Y_POS = 0x10
+MOT_Z_NEG = 0x08
+MOT_Z_POS = 0x04
+MOT_ZRMOT = 0x01
+
+# FIFO registers
+REG_FIFO_EN = 0x23
+REG_USER_CTRL = 0x6A
+REG_FIFO_COUNTH = 0x72
+REG_FIFO_COUNTL = 0x73
+REG_FIFO_R_W = 0x74
+
+# FIFO values
+FIFO_SIZE = 1024
+FIFO_BURST_SIZE = 252 # max bytes drained with a single read
+
+# Power values
+LP_WAKE_RATES = [1.25, 5, 20, 40] # accel-only low power wake-up frequencies, by LP_WAKE_CTRL value
+GYRO_START_TIME = 30 # gyroscope start-up time in ms (typical, from the datasheet)
+
+# Gyroscope gating transitions
+GYRO_GATED = 1
+GYRO_RESUMED = 2
+
 # Motion values
 DELAY = 3
 THRESHOLD = 2
@@ -112,13 +187,19 @@ class MPU6050(i2c.I2C):
  MPU6050 class
 ===============
 
-.. class:: MPU6050(drvname, addr=0x68, clk=400000)
+.. class:: MPU6050(drvname, addr=0x68, clk=400000, cache=False, profile=None)
 
     Creates an intance of the MPU6050 class.
 
     :param drvname: I2C Bus used '( I2C0, ... )'
     :param addr: Slave address, default 0x68
     :param clk: Clock speed, default 400kHz
+    :param cache: Enable the write-through shadow cache of the configuration registers, default False
+    :param profile: Calibration profile returned by :meth:`export_profile`, applied instead of the default configuration, default None
+
+    When the cache is enabled, PWR_MGMT_1, PWR_MGMT_2, CONFIG, GYRO_CONFIG, ACCEL_CONFIG, INT_ENABLE and
+    MOT_DETECT_CTRL are read from memory instead of the bus, while every write still goes to the sensor.
+    Use :meth:`refresh_cache` or :meth:`invalidate_cache` after a reset of the sensor.
     
     Temperature, accelerometer and gyroscope value can be easily obtained from the sensor: ::
 
@@ -164,11 +245,29 @@ class MPU6050(i2c.I2C):
         GYRO_SENSITIVITY_2000DPS
     ]
 
-    def __init__(self, drvname, addr=0x68, clk=400000):
+    # configuration registers held in the shadow cache, in cache slot order
+    cached_registers = {
+        PWR_MGMT_1: 0,
+        PWR_MGMT_2: 1,
+        REG_CONFIG: 2,
+        GYRO_CONFIG: 3,
+        ACCEL_CONFIG: 4,
+        REG_INT_ENABLE: 5,
+        REG_MOT_DETECT_CTRL: 6
+    }
+
+    def __init__(self, drvname, addr=0x68, clk=400000, cache=False, profile=None):
         
         if (addr != 0x68 and addr != 0x69):
             raise ValueError
 
+        if (cache != True and cache != False):
+            raise ValueError
+
+        # Bus instrumentation counters (None when disabled)
+        self._stats = None
+        self._reg_stats = None
+
         i2c.I2C.__init__(self,drvname,addr,clk)
         try:
             self.start()
@@ -179,18 +278,309 @@ class MPU6050(i2c.I2C):
         if (self.write_read(REG_WHO_AM_I, n=1)[0] != 0x68):
             raise ValueError
 
-        # Set Clock source
-        self.set_clock_source(1)
-        # Set scales
-        self.set_accel_fullscale(2)
-        self.set_gyro_fullscale(2000)
-        # Set dlpf mode
-        self.set_dlpf_mode(0)
-        # Disable Sleep Mode
-        self.set_sleep_mode(False)
+        # Shadow cache of the configuration registers (None when disabled)
+        self._cache = None
+        self._cache_valid = False
+        if (cache):
+            self._cache = bytearray(len(self.cached_registers))
+
+        # Scale factors from raw counts, updated by the full-scale setters
+        self._accel_scale_g = 1 / ACCEL_SENSITIVITY_2G
+        self._accel_scale_ms2 = GRAVITIY_MS2 / ACCEL_SENSITIVITY_2G
+        self._gyro_scale = 1 / GYRO_SENSITIVITY_250DPS
+
+        # FIFO frame layout, updated by set_fifo_channels
+        self._fifo_accel = False
+        self._fifo_temp = False
+        self._fifo_gyro = False
+        self._fifo_frame_size = 0
+        # FIFO overflow bookkeeping
+        self._fifo_gap = 0
+        self._fifo_pending_gap = 0
+        self._fifo_overflows = 0
+        self._fifo_dropped = 0
+
+        # Active channels (bit i is channel i of accel X, Y, Z, temp, gyro X, Y, Z) and burst read span
+        self._active = 0b1111111
+        self._sample = bytearray(14)
+        # channels powered on: the active ones, less those turned off by the low power mode or the gyroscope gating
+        self._span_active = 0b1111111
+        self._span_ofs = 0
+        self._span_len = 14
+        self._span_zero = []
+
+        # Low power cycle mode
+        self._low_power = False
+        self._lp_clock = 1
+
+        # Gyroscope gating driven by zero motion detection
+        self._gating = False
+        self._gyro_gated = False
+        self._gate_clock = 1
+        # MOT_EN and ZMOT_EN bits to restore when the gating is disabled
+        self._gate_int = 0
+
+        # Interrupt events latched by poll_events
+        self._events = 0
+
+        # INT pin polarity and data ready callback
+        self._int_active_low = False
+        self._int_open_drain = False
+        self._drdy_callback = None
+        self._drdy_g = False
+
+        if (profile is None):
+            # Set clock source, scales and dlpf mode, disable Sleep Mode
+            self.configure(clock=1, accel_fullscale=2, gyro_fullscale=2000, dlpf=0, sleep=False)
+        else:
+            # Warm start: offsets and configuration from a saved profile
+            self.apply_profile(profile)
+            self.configure(clock=1, sleep=False)
 
     # MPU-6050 Methods
 
+    def write_read(self, data, n, timeout=-1):
+        """
+    .. method:: write_read(data, n, timeout=-1)
+
+        Write *data* and read *n* bytes from the sensor (see ``i2c.I2C.write_read``).
+        When the instrumentation is enabled with :meth:`enable_stats`, the transaction is accounted.
+
+        """
+        stats = self._stats
+        if (stats is None):
+            return i2c.I2C.write_read(self, data, n=n, timeout=timeout)
+
+        t0 = timers.now()
+        try:
+            res = i2c.I2C.write_read(self, data, n=n, timeout=timeout)
+        except Exception as e:
+            stats[4] += 1
+            raise e
+        stats[5] += timers.now() - t0
+        stats[0] += 1
+        stats[2] += n
+        if (type(data) == PINT):
+            stats[3] += 1
+        else:
+            stats[3] += len(data)
+            data = data[0]
+        self._reg_stats[data & 0x7F] += 1
+        return res
+
+    def write_bytes(self, *args, timeout=-1):
+        """
+    .. method:: write_bytes(*args, timeout=-1)
+
+        Write the bytes in *args* to the sensor (see ``i2c.I2C.write_bytes``).
+        When the instrumentation is enabled with :meth:`enable_stats`, the transaction is accounted.
+
+        """
+        stats = self._stats
+        if (stats is None):
+            return i2c.I2C.write_bytes(self, *args, timeout=timeout)
+
+        t0 = timers.now()
+        try:
+            i2c.I2C.write_bytes(self, *args, timeout=timeout)
+        except Exception as e:
+            stats[4] += 1
+            raise e
+        stats[5] += timers.now() - t0
+        stats[1] += 1
+        stats[3] += len(args)
+        reg = args[0]
+        if (type(reg) != PINT):
+            reg = reg[0]
+        self._reg_stats[reg & 0x7F] += 1
+
+    def enable_stats(self, state):
+        """
+    .. method:: enable_stats(state)
+
+        :param state: if True, the bus transactions are accounted, otherwise the instrumentation is disabled.
+
+        Enable or disable the instrumentation of the bus transactions generated by the driver.
+        Enabling it resets the counters.
+
+        """
+        if (state != True and state != False):
+            raise ValueError
+
+        if (state):
+            # reads, writes, bytes read, bytes written, errors, bus time
+            self._stats = [0, 0, 0, 0, 0, 0]
+            # transactions by register address
+            self._reg_stats = [0] * 128
+        else:
+            self._stats = None
+            self._reg_stats = None
+
+    def reset_stats(self):
+        """
+    .. method:: reset_stats()
+
+        Reset the instrumentation counters.
+
+        """
+        if (self._stats is not None):
+            for i in range(len(self._stats)):
+                self._stats[i] = 0
+            for i in range(len(self._reg_stats)):
+                self._reg_stats[i] = 0
+
+    def stats(self):
+        """
+    .. method:: stats()
+
+        Return a snapshot of the instrumentation counters in a dictionary:
+
+        ================ =====================================================
+         key              value
+        ================ =====================================================
+         reads            number of write_read transactions
+         writes           number of write_bytes transactions
+         transactions     total number of transactions
+         bytes_read       number of bytes read (register addresses excluded)
+         bytes_written    number of bytes written (register addresses included)
+         errors           number of transactions that raised an exception
+         bus_time         cumulative time spent in transactions, in milliseconds
+         registers        dictionary with the number of transactions for each register address
+        ================ =====================================================
+
+        Every transaction starts from a register address, so *registers* tells which operation generated the traffic
+        (e.g. 0x3B for the data bursts of :meth:`get_values` and :meth:`read_raw`, 0x74 for :meth:`read_fifo`,
+        0x3A for the interrupt status checks).
+
+        *bus_time* is coarse: ``timers.now()`` has a resolution of one millisecond, while a transaction usually takes
+        less (a 14 bytes burst at 400kHz takes about 0.4ms), so each transaction adds 0 or 1. The sum is meaningful only
+        over many transactions, where the rounding averages out.
+
+        Return None when the instrumentation is disabled.
+
+        """
+        stats = self._stats
+        if (stats is None):
+            return None
+
+        registers = {}
+        for i in range(len(self._reg_stats)):
+            if (self._reg_stats[i]):
+                registers[i] = self._reg_stats[i]
+
+        return {
+            'reads': stats[0],
+            'writes': stats[1],
+            'transactions': stats[0] + stats[1],
+            'bytes_read': stats[2],
+            'bytes_written': stats[3],
+            'errors': stats[4],
+            'bus_time': stats[5],
+            'registers': registers
+        }
+
+    ##
+    ## @brief      Read a configuration register, serving it from the shadow cache when enabled.
+    ##
+    ## @param      self
+    ## @param      reg  is the register to read.
+    ## @return     the value of the register.
+    ##
+    def _read_reg(self, reg):
+        if (self._cache is not None and reg in self.cached_registers):
+            if (not self._cache_valid):
+                self.refresh_cache()
+            return self._cache[self.cached_registers[reg]]
+        return self.write_read(reg, n=1)[0]
+
+    ##
+    ## @brief      Write a configuration register, updating the shadow cache when enabled.
+    ##
+    ## @param      self
+    ## @param      reg      is the register to write.
+    ## @param      value    is the value to write.
+    ## @return     nothing
+    ##
+    def _write_reg(self, reg, value):
+        value &= 0xFF
+        self.write_bytes(reg, value)
+        if (self._cache is not None and reg in self.cached_registers):
+            self._cache[self.cached_registers[reg]] = value
+
+    ##
+    ## @brief      Write consecutive registers with a single transaction, updating the shadow cache when enabled.
+    ##
+    ## @param      self
+    ## @param      reg      is the first register to write.
+    ## @param      data     is the sequence of values to write, starting from reg.
+    ## @return     nothing
+    ##
+    def _write_block(self, reg, data):
+        self.write_bytes(reg, *data)
+        if (self._cache is not None):
+            for i in range(len(data)):
+                if ((reg + i) in self.cached_registers):
+                    self._cache[self.cached_registers[reg + i]] = data[i] & 0xFF
+
+    ##
+    ## @brief      Update the cached accelerometer scale factors (LSB to g and LSB to m/s^2).
+    ##
+    ## @param      self
+    ## @param      fs_sel   is the AFS_SEL value (0-3) the accelerometer is set to.
+    ## @return     nothing
+    ##
+    def _update_accel_scale(self, fs_sel):
+        self._accel_scale_g = 1 / self.accel_sensitivity[fs_sel]
+        self._accel_scale_ms2 = GRAVITIY_MS2 / self.accel_sensitivity[fs_sel]
+
+    ##
+    ## @brief      Update the cached gyroscope scale factor (LSB to dps).
+    ##
+    ## @param      self
+    ## @param      fs_sel   is the FS_SEL value (0-3) the gyroscope is set to.
+    ## @return     nothing
+    ##
+    def _update_gyro_scale(self, fs_sel):
+        self._gyro_scale = 1 / self.gyro_sensitivity[fs_sel]
+
+    def refresh_cache(self):
+        """
+    .. method:: refresh_cache()
+
+        Reload the shadow cache from the configuration registers of the sensor.
+        Call it after the sensor has been reset or reconfigured by someone else.
+        Does nothing when the sensor was created with ``cache=False``.
+
+        """
+        if (self._cache is None):
+            return
+
+        # CONFIG, GYRO_CONFIG and ACCEL_CONFIG are consecutive
+        data = self.write_read(REG_CONFIG, n=3)
+        self._cache[self.cached_registers[REG_CONFIG]] = data[0]
+        self._cache[self.cached_registers[GYRO_CONFIG]] = data[1]
+        self._cache[self.cached_registers[ACCEL_CONFIG]] = data[2]
+        self._cache[self.cached_registers[REG_INT_ENABLE]] = self.write_read(REG_INT_ENABLE, n=1)[0]
+        self._cache[self.cached_registers[REG_MOT_DETECT_CTRL]] = self.write_read(REG_MOT_DETECT_CTRL, n=1)[0]
+        # PWR_MGMT_1 and PWR_MGMT_2 are consecutive
+        data = self.write_read(PWR_MGMT_1, n=2)
+        self._cache[self.cached_registers[PWR_MGMT_1]] = data[0]
+        self._cache[self.cached_registers[PWR_MGMT_2]] = data[1]
+        self._cache_valid = True
+
+        # keep the scale factors consistent with the full-scale ranges read back
+        self._update_accel_scale((self._cache[self.cached_registers[ACCEL_CONFIG]] >> 3) & 0b11)
+        self._update_gyro_scale((self._cache[self.cached_registers[GYRO_CONFIG]] >> 3) & 0b11)
+
+    def invalidate_cache(self):
+        """
+    .. method:: invalidate_cache()
+
+        Mark the shadow cache as stale: it will be reloaded from the sensor on the next configuration read.
+
+        """
+        self._cache_valid = False
+
     ##
     ## @brief      Get the value of bit SLEEP from PWR_MGMT_1 register.
     ##
@@ -198,7 +588,7 @@ class MPU6050(i2c.I2C):
     ## @return     value of bit SLEEP from PWR_MGMT_1 register.
     ##
     def is_sleep_mode(self):
-        value = self.write_read(PWR_MGMT_1, n=1)[0]
+        value = self._read_reg(PWR_MGMT_1)
         return ((value >> 6) & 1)
 
     ##
@@ -212,15 +602,94 @@ class MPU6050(i2c.I2C):
         if (state != True and state != False):
             raise ValueError
 
-        value = self.write_read(PWR_MGMT_1, n=1)[0]
+        value = self._read_reg(PWR_MGMT_1)
 
         if (state):
             value |= (1 << 6)
         else: 
             value &= ~(1 << 6)
 
-        self.write_bytes(PWR_MGMT_1, value)
+        self._write_reg(PWR_MGMT_1, value)
     
+    def set_low_power_accel(self, rate):
+        """
+    .. method:: set_low_power_accel(rate)
+
+        :param rate: is the wake-up frequency in Hz. Values accepted: 1.25, 5, 20 or 40.
+
+        Enter the accelerometer-only low power cycle mode: the gyroscopes are put in standby, the temperature sensor is
+        disabled, the clock source is switched to the internal oscillator and the sensor wakes up at *rate* to take a
+        single accelerometer sample, sleeping in between. Read the samples with :meth:`read_raw_accel` or :meth:`get_accel_values`.
+
+        Use :meth:`exit_low_power` to go back to normal mode. The gyroscope gating (see :meth:`set_gyro_gating`)
+        must be disabled.
+
+        """
+        if (rate not in LP_WAKE_RATES):
+            raise ValueError
+        if (self._gating):
+            raise ValueError
+
+        pwr1 = self._read_reg(PWR_MGMT_1)
+        if (not self._low_power):
+            # clock source to restore when leaving the low power mode
+            self._lp_clock = pwr1 & 0b00000111
+
+        # LP_WAKE_CTRL and gyroscopes in standby (STBY_XG, STBY_YG, STBY_ZG)
+        pwr2 = self._read_reg(PWR_MGMT_2)
+        pwr2 &= 0b00111000
+        pwr2 |= (LP_WAKE_RATES.index(rate) << 6) | 0b00000111
+        self._write_reg(PWR_MGMT_2, pwr2)
+
+        # CYCLE = 1, SLEEP = 0, TEMP_DIS = 1, internal oscillator
+        pwr1 &= 0b10010000
+        pwr1 |= (1 << 5) | (1 << 3)
+        self._write_reg(PWR_MGMT_1, pwr1)
+
+        self._low_power = True
+        # only the accelerometer axes are read
+        self._update_span(self._active & 0b0000111)
+
+    def exit_low_power(self):
+        """
+    .. method:: exit_low_power()
+
+        Leave the low power cycle mode entered with :meth:`set_low_power_accel`: the gyroscopes and the temperature
+        sensor active before (see :meth:`set_active_axes`) are enabled, the previous clock source is restored and the method waits for the gyroscopes to start up.
+
+        """
+        if (not self._low_power):
+            return
+
+        # gyroscopes set active with set_active_axes are enabled again
+        pwr2 = self._read_reg(PWR_MGMT_2)
+        pwr2 &= 0b00111000
+        for i in range(3):
+            if (not (self._active & (1 << (4 + i)))):
+                pwr2 |= (1 << (2 - i))
+        self._write_reg(PWR_MGMT_2, pwr2)
+
+        # CYCLE = 0, TEMP_DIS as set with set_active_axes, previous clock source
+        pwr1 = self._read_reg(PWR_MGMT_1)
+        pwr1 &= 0b11010000
+        if (not (self._active & (1 << 3))):
+            pwr1 |= (1 << 3)
+        pwr1 |= self._lp_clock
+        self._write_reg(PWR_MGMT_1, pwr1)
+
+        self._low_power = False
+        self._update_span(self._active)
+        sleep(GYRO_START_TIME)
+
+    def is_low_power(self):
+        """
+    .. method:: is_low_power()
+
+        Return True if the sensor is in the low power cycle mode, otherwise False.
+
+        """
+        return self._low_power
+
     def set_dlpf_mode(self, dlpf):
         """
     .. method:: set_dlpf_mode(dlpf)
@@ -235,10 +704,85 @@ class MPU6050(i2c.I2C):
         if (dlpf not in [0, 1, 2, 3, 4, 5, 6, 7]):
             raise ValueError
 
-        value = self.write_read(REG_CONFIG, n=1)[0]
+        value = self._read_reg(REG_CONFIG)
         value &= 0b11111000
         value |= dlpf
-        self.write_bytes(REG_CONFIG, value)
+        self._write_reg(REG_CONFIG, value)
+
+    def get_dlpf_mode(self):
+        """
+    .. method:: get_dlpf_mode()
+
+        Return the DLPF mode the sensor is set to.
+
+        """
+        return self._read_reg(REG_CONFIG) & 0b00000111
+
+    ##
+    ## @brief      Get the gyroscope output rate, that depends on the DLPF mode.
+    ##
+    ## @param      self
+    ## @param      dlpf     is the DLPF mode. If None, it is read from the sensor.
+    ## @return     the gyroscope output rate in Hz (8000 when the DLPF is disabled, 1000 otherwise).
+    ##
+    def _get_gyro_output_rate(self, dlpf=None):
+        if (dlpf is None):
+            dlpf = self.get_dlpf_mode()
+        if (dlpf == 0 or dlpf == 7):
+            return 8000
+        return 1000
+
+    ##
+    ## @brief      Compute the sample rate divider giving the closest achievable sample rate.
+    ##
+    ## @param      self
+    ## @param      dlpf     is the DLPF mode, that sets the gyroscope output rate.
+    ## @param      rate     is the desired sample rate in Hz.
+    ## @return     a list [div, rate] with the SMPLRT_DIV value and the sample rate it gives, in Hz.
+    ##
+    def _compute_divider(self, dlpf, rate):
+        gyro_rate = self._get_gyro_output_rate(dlpf)
+        div = int(gyro_rate / rate + 0.5) - 1
+        if (div < 0):
+            div = 0
+        elif (div > 255):
+            div = 255
+        return [div, gyro_rate / (1 + div)]
+
+    def set_sample_rate(self, rate):
+        """
+    .. method:: set_sample_rate(rate)
+
+        :param rate: is the desired sample rate in Hz.
+
+        Set the sample rate divider (SMPLRT_DIV register) to get the closest achievable sample rate,
+        computed from the gyroscope output rate (8kHz when DLPF mode is 0 or 7, 1kHz otherwise).
+        Return the sample rate actually set, in Hz.
+
+        Since the gyroscope output rate depends on the DLPF mode, call it after :meth:`set_dlpf_mode`.
+
+        """
+        if (rate <= 0):
+            raise ValueError
+
+        div, rate = self._compute_divider(self.get_dlpf_mode(), rate)
+        self.write_bytes(REG_SMPLRT_DIV, div)
+
+        return rate
+
+    def get_sample_rate(self):
+        """
+    .. method:: get_sample_rate()
+
+        Return the sample rate the sensor is set to, in Hz. In low power cycle mode (see :meth:`set_low_power_accel`)
+        it is the wake-up frequency.
+
+        """
+        if (self._low_power):
+            return LP_WAKE_RATES[self._read_reg(PWR_MGMT_2) >> 6]
+
+        div = self.write_read(REG_SMPLRT_DIV, n=1)[0]
+        return self._get_gyro_output_rate() / (1 + div)
     
     def set_dhpf_mode(self, dhpf):
         """
@@ -265,10 +809,10 @@ class MPU6050(i2c.I2C):
         if (dhpf not in [0, 1, 2, 3, 4, 7]):
             raise ValueError
 
-        value = self.write_read(ACCEL_CONFIG, n=1)[0]
+        value = self._read_reg(ACCEL_CONFIG)
         value &= 0b11111000
         value |= dhpf
-        self.write_bytes(ACCEL_CONFIG, value)
+        self._write_reg(ACCEL_CONFIG, value)
 
     def get_clock_source(self):
         """
@@ -277,7 +821,7 @@ class MPU6050(i2c.I2C):
         Return the clock source the sensor is set to.
 
         """
-        clock_source = self.write_read(PWR_MGMT_1, n=1)[0]
+        clock_source = self._read_reg(PWR_MGMT_1)
         clock_source &= 0b00000111
 
         return clock_source
@@ -309,10 +853,10 @@ class MPU6050(i2c.I2C):
         if (clksel not in [0, 1, 2, 3, 4, 5, 7]):
             raise ValueError
 
-        value = self.write_read(PWR_MGMT_1, n=1)[0]
+        value = self._read_reg(PWR_MGMT_1)
         value &= 0b11111000
         value |=  clksel
-        self.write_bytes(PWR_MGMT_1, value)
+        self._write_reg(PWR_MGMT_1, value)
 
     def get_temp(self):
         """
@@ -345,16 +889,19 @@ class MPU6050(i2c.I2C):
             raise ValueError
 
         # First change it to 0x00 to make sure we write the correct value later
-        self.write_bytes(ACCEL_CONFIG, 0x00)
+        self._write_reg(ACCEL_CONFIG, 0x00)
 
         # get corrisponding full-scale value from dictionary
         full_scale = self.accel_fullscale[str(full_scale)]
 
         # Write the new full-scale to the ACCEL_CONFIG register
-        value = self.write_read(ACCEL_CONFIG, n=1)[0]
+        value = self._read_reg(ACCEL_CONFIG)
         value &= 0b11100111
         value |= (full_scale << 3)
-        self.write_bytes(ACCEL_CONFIG, value)
+        self._write_reg(ACCEL_CONFIG, value)
+
+        # Update the cached scale factors
+        self._update_accel_scale(full_scale)
 
     def get_accel_fullscale(self):
         """
@@ -365,7 +912,7 @@ class MPU6050(i2c.I2C):
         
         """
         # Get the raw value
-        raw_data = self.write_read(ACCEL_CONFIG, n=1)[0]
+        raw_data = self._read_reg(ACCEL_CONFIG)
         raw_data &= 0b00011000
         raw_data >>= 3
 
@@ -376,6 +923,19 @@ class MPU6050(i2c.I2C):
                 return values[i]
         return -1
 
+    def get_accel_scale(self, g=False):
+        """
+    .. method:: get_accel_scale(g=False)
+
+        :param g: is the unit of the scale. If g = False is m/s^2, otherwise is g.
+
+        Return the value of one raw accelerometer count at the current full-scale range (see :meth:`read_raw`).
+
+        """
+        if (g):
+            return self._accel_scale_g
+        return self._accel_scale_ms2
+
     def get_accel_values(self, g = False):
         """
     .. method:: get_accel_values(g = False)
@@ -396,28 +956,13 @@ class MPU6050(i2c.I2C):
         y = _tc(data[2] << 8 | data[3]) # Y-axis value
         z = _tc(data[4] << 8 | data[5]) # Z-axis value
 
-        full_scale = self.get_accel_fullscale()
-
-        # set default accel sensitivity
-        accel_sensitivity = ACCEL_SENSITIVITY_2G
-
-        # get accel full-scale
-        values = ['2', '4', '8', '16']
-        for i in range(len(values)):
-            if (full_scale == self.accel_fullscale[values[i]]):
-                accel_sensitivity = self.accel_sensitivity[i]
-
-        x = x / accel_sensitivity
-        y = y / accel_sensitivity
-        z = z / accel_sensitivity
-
+        # use the cached scale factor
         if g is True:
-            return {'x': x, 'y': y, 'z': z}
-        elif g is False:
-            x = x * GRAVITIY_MS2
-            y = y * GRAVITIY_MS2
-            z = z * GRAVITIY_MS2
-            return {'x': x, 'y': y, 'z': z}
+            scale = self._accel_scale_g
+        else:
+            scale = self._accel_scale_ms2
+
+        return {'x': x * scale, 'y': y * scale, 'z': z * scale}
 
     def set_gyro_fullscale(self, full_scale):
         """
@@ -432,16 +977,19 @@ class MPU6050(i2c.I2C):
             raise ValueError
 
         # First change it to 0x00 to make sure we write the correct value later
-        self.write_bytes(GYRO_CONFIG, 0x00)
+        self._write_reg(GYRO_CONFIG, 0x00)
 
         # get gyro full-scale from dictionary
         full_scale = self.gyro_fullscale[str(full_scale)]
 
         # Write the new full-scale to the ACCEL_CONFIG register
-        value = self.write_read(GYRO_CONFIG, n=1)[0]
+        value = self._read_reg(GYRO_CONFIG)
         value &= 0b11100111
         value |= (full_scale << 3)
-        self.write_bytes(GYRO_CONFIG, value)
+        self._write_reg(GYRO_CONFIG, value)
+
+        # Update the cached scale factor
+        self._update_gyro_scale(full_scale)
 
     def get_gyro_fullscale(self):
         """
@@ -452,7 +1000,7 @@ class MPU6050(i2c.I2C):
         
         """
         # Get the raw value
-        raw_data = self.write_read(GYRO_CONFIG, n=1)[0]
+        raw_data = self._read_reg(GYRO_CONFIG)
         raw_data &= 0b00011000
         raw_data >>= 3
 
@@ -463,6 +1011,15 @@ class MPU6050(i2c.I2C):
                 return values[i]
         return -1
 
+    def get_gyro_scale(self):
+        """
+    .. method:: get_gyro_scale()
+
+        Return the value of one raw gyroscope count at the current full-scale range, in deg/s (see :meth:`read_raw`).
+
+        """
+        return self._gyro_scale
+
     def get_gyro_values(self):
         """
     .. method:: get_gyro_values()
@@ -476,22 +1033,10 @@ class MPU6050(i2c.I2C):
         y = _tc(data[2] << 8 | data[3]) # Y-axis value
         z = _tc(data[4] << 8 | data[5]) # Z-axis value
 
-        full_scale = self.get_gyro_fullscale()
-
-        # set default gyro sensitivity
-        gyro_sensitivity = GYRO_SENSITIVITY_250DPS
-
-        # get gyro sensitivity
-        values = ['250', '500', '1000', '2000']
-        for i in range(len(values)):
-            if (full_scale == self.gyro_fullscale[values[i]]):
-                gyro_sensitivity = self.gyro_sensitivity[i]
-
-        x = x / gyro_sensitivity
-        y = y / gyro_sensitivity
-        z = z / gyro_sensitivity
+        # use the cached scale factor
+        scale = self._gyro_scale
 
-        return {'x': x, 'y': y, 'z': z}
+        return {'x': x * scale, 'y': y * scale, 'z': z * scale}
 
     def get_values(self, g=False):
         """
@@ -502,16 +1047,501 @@ class MPU6050(i2c.I2C):
                   Default value is False.
 
         Return the values of temperature, gyroscope and accelerometer in a list [temp, accel, gyro].
+        Only the channels enabled with :meth:`set_active_axes` (and not turned off by the low power mode) are read:
+        disabled axes are reported as 0 and temp is None when the temperature sensor is disabled.
         
         """
         if (g != True and g != False):
             raise ValueError
 
-        temp = self.get_temp()
-        accel = self.get_accel_values(g)
-        gyro = self.get_gyro_values()
+        # Read accel, temp and gyro registers (0x3B..0x48) in a single burst,
+        # so that all the values come from the same sample instant
+        data = self._read_sample()
 
-        return [temp, accel, gyro]
+        # use the cached scale factors
+        if g is True:
+            accel_scale = self._accel_scale_g
+        else:
+            accel_scale = self._accel_scale_ms2
+        gyro_scale = self._gyro_scale
+
+        ax = _tc(data[0] << 8 | data[1]) * accel_scale
+        ay = _tc(data[2] << 8 | data[3]) * accel_scale
+        az = _tc(data[4] << 8 | data[5]) * accel_scale
+
+        temp = None
+        if (self._span_active & 0b0001000):
+            temp = (_tc(data[6] << 8 | data[7]) / 340) + 36.53
+
+        gx = _tc(data[8] << 8 | data[9]) * gyro_scale
+        gy = _tc(data[10] << 8 | data[11]) * gyro_scale
+        gz = _tc(data[12] << 8 | data[13]) * gyro_scale
+
+        return [temp, {'x': ax, 'y': ay, 'z': az}, {'x': gx, 'y': gy, 'z': gz}]
+
+    ##
+    ## @brief      Read the data registers of the active channels with a single burst.
+    ##
+    ## @param      self
+    ## @return     a 14 bytes buffer laid out as ACCEL_XOUT0..GYRO_ZOUT1, where the channels not active are 0.
+    ##
+    def _read_sample(self):
+        ofs = self._span_ofs
+        n = self._span_len
+        if (n == 14):
+            return self.write_read(ACCEL_XOUT0, n=14)
+
+        sample = self._sample
+        sample[ofs:ofs + n] = self.write_read(ACCEL_XOUT0 + ofs, n=n)
+        # channels in standby inside the span
+        for i in self._span_zero:
+            sample[i] = 0
+            sample[i + 1] = 0
+        return sample
+
+    def set_active_axes(self, accel='xyz', gyro='xyz', temp=True):
+        """
+    .. method:: set_active_axes(accel='xyz', gyro='xyz', temp=True)
+
+        :param accel: is a string with the accelerometer axes to keep active (e.g. ``'z'``), the others are put in standby.
+        :param gyro: is a string with the gyroscope axes to keep active (e.g. ``'xz'``), the others are put in standby.
+        :param temp: if False, the temperature sensor is disabled.
+
+        Put the unused axes in standby (PWR_MGMT_2 register) and disable the temperature sensor if not needed,
+        reducing the current drawn by the sensor. The burst read paths (:meth:`get_values`, :meth:`get_values_into`
+        and :meth:`read_raw`) then read only the registers from the first to the last active channel and
+        report the channels in standby as 0.
+
+        If the clock source is the PLL of a gyroscope put in standby, it is switched to the PLL of an active
+        gyroscope, or to the internal oscillator when no gyroscope is active.
+        It cannot be called in low power cycle mode (see :meth:`set_low_power_accel`) or while the gyroscopes
+        are gated (see :meth:`set_gyro_gating`).
+
+        """
+        if (temp != True and temp != False):
+            raise ValueError
+        if (self._low_power or self._gyro_gated):
+            raise ValueError
+
+        stby = 0b111111
+        for axis in accel:
+            if (axis not in 'xyz'):
+                raise ValueError
+            stby &= ~(1 << (5 - 'xyz'.index(axis)))
+        for axis in gyro:
+            if (axis not in 'xyz'):
+                raise ValueError
+            stby &= ~(1 << (2 - 'xyz'.index(axis)))
+
+        pwr2 = self._read_reg(PWR_MGMT_2)
+        pwr2 = (pwr2 & 0b11000000) | stby
+        self._write_reg(PWR_MGMT_2, pwr2)
+
+        pwr1 = self._read_reg(PWR_MGMT_1)
+        clksel = pwr1 & 0b00000111
+        if (clksel >= 1 and clksel <= 3 and (stby & (1 << (3 - clksel)))):
+            # the PLL reference gyroscope is in standby
+            clksel = 0
+            for i in range(3):
+                if (not (stby & (1 << (2 - i)))):
+                    clksel = i + 1
+                    break
+        pwr1 = (pwr1 & 0b11110000) | clksel
+        if (not temp):
+            pwr1 |= (1 << 3)
+        self._write_reg(PWR_MGMT_1, pwr1)
+
+        # bit i is channel i in data registers order: accel X, Y, Z, temp, gyro X, Y, Z
+        active = 0
+        for i in range(3):
+            if (not (stby & (1 << (5 - i)))):
+                active |= (1 << i)
+            if (not (stby & (1 << (2 - i)))):
+                active |= (1 << (4 + i))
+        if (temp):
+            active |= (1 << 3)
+        self._active = active
+        self._update_span(active)
+
+    ##
+    ## @brief      Compute the register span read by the burst read paths from the channels powered on.
+    ##
+    ## @param      self
+    ## @param      active   is the mask of the channels powered on (bit i is channel i, see _active).
+    ## @return     nothing
+    ##
+    def _update_span(self, active):
+        self._span_active = active
+        first = -1
+        last = -1
+        for i in range(7):
+            if (active & (1 << i)):
+                if (first < 0):
+                    first = i
+                last = i
+        if (first < 0):
+            # nothing active: read a single channel
+            first = 0
+            last = 0
+
+        zero = []
+        for i in range(first, last + 1):
+            if (not (active & (1 << i))):
+                zero.append(2 * i)
+
+        self._span_ofs = 2 * first
+        self._span_len = 2 * (last - first + 1)
+        self._span_zero = zero
+        for i in range(14):
+            self._sample[i] = 0
+
+    def get_active_axes(self):
+        """
+    .. method:: get_active_axes()
+
+        Return the active channels in a list [accel, gyro, temp], where accel and gyro are strings with the active axes
+        and temp is True if the temperature sensor is enabled.
+
+        """
+        accel = ''
+        gyro = ''
+        for i in range(3):
+            if (self._active & (1 << i)):
+                accel += 'xyz'[i]
+            if (self._active & (1 << (4 + i))):
+                gyro += 'xyz'[i]
+        return [accel, gyro, (self._active & (1 << 3)) != 0]
+
+    def read_raw(self, buf=None):
+        """
+    .. method:: read_raw(buf=None)
+
+        :param buf: is an optional preallocated buffer of at least 7 signed 16-bit items (e.g. a list, an ``array('h')`` or a memoryview).
+
+        Read the raw accelerometer, temperature and gyroscope counts with a single burst, without any conversion.
+        The seven signed values are stored in *buf* in the order accel X, Y, Z, temp, gyro X, Y, Z.
+        Channels disabled with :meth:`set_active_axes` are not read and are reported as 0.
+        Return *buf*, or a new list when *buf* is None.
+
+        """
+        data = self._read_sample()
+
+        if (buf is None):
+            buf = [0, 0, 0, 0, 0, 0, 0]
+
+        for i in range(7):
+            buf[i] = _tc(data[2 * i] << 8 | data[2 * i + 1])
+
+        return buf
+
+    def read_raw_accel(self, buf=None):
+        """
+    .. method:: read_raw_accel(buf=None)
+
+        :param buf: is an optional preallocated buffer of at least 3 signed 16-bit items.
+
+        Read the raw accelerometer counts (6 bytes) with a single burst, without any conversion: it is the read path
+        of the low power cycle mode (see :meth:`set_low_power_accel`). The X, Y and Z values are stored in *buf*.
+        Return *buf*, or a new list when *buf* is None.
+
+        """
+        data = self.write_read(ACCEL_XOUT0, n=6)
+
+        if (buf is None):
+            buf = [0, 0, 0]
+
+        buf[0] = _tc(data[0] << 8 | data[1])
+        buf[1] = _tc(data[2] << 8 | data[3])
+        buf[2] = _tc(data[4] << 8 | data[5])
+
+        return buf
+
+    def get_values_into(self, out, g=False):
+        """
+    .. method:: get_values_into(out, g=False)
+
+        :param out: is a preallocated list (or float array) of at least 7 items, reused across calls.
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Read accelerometer, temperature and gyroscope with a single burst and store the converted values in *out*,
+        in the order accel X, Y, Z, temp, gyro X, Y, Z. Return *out*.
+
+        Unlike :meth:`get_values`, no list or dictionary is created, so it can be called in high rate loops
+        without triggering the garbage collector. Channels disabled with :meth:`set_active_axes` (or turned off by the low power
+        mode) are reported as 0, temperature included. ::
+
+            values = [0.0] * 7
+            while True:
+                mpu.get_values_into(values)
+
+        """
+        if g is True:
+            accel_scale = self._accel_scale_g
+        else:
+            accel_scale = self._accel_scale_ms2
+        gyro_scale = self._gyro_scale
+
+        data = self._read_sample()
+
+        # unrolled to avoid creating iterators
+        out[0] = _tc(data[0] << 8 | data[1]) * accel_scale
+        out[1] = _tc(data[2] << 8 | data[3]) * accel_scale
+        out[2] = _tc(data[4] << 8 | data[5]) * accel_scale
+        if (self._span_active & 0b0001000):
+            out[3] = (_tc(data[6] << 8 | data[7]) / 340) + 36.53
+        else:
+            out[3] = 0.0
+        out[4] = _tc(data[8] << 8 | data[9]) * gyro_scale
+        out[5] = _tc(data[10] << 8 | data[11]) * gyro_scale
+        out[6] = _tc(data[12] << 8 | data[13]) * gyro_scale
+
+        return out
+
+    def get_offsets(self):
+        """
+    .. method:: get_offsets()
+
+        Return the hardware offsets in a list [accel, gyro], where accel is the list of the X, Y and Z values of the
+        accelerometer offset registers (+-16g format) and gyro the list of the X, Y and Z values of the gyroscope
+        offset registers (+-1000dps format).
+
+        """
+        accel = self.write_read(XA_OFFS_H, n=6)
+        gyro = self.write_read(XG_OFFS_USRH, n=6)
+        return [
+            [_tc(accel[2 * i] << 8 | accel[2 * i + 1]) for i in range(3)],
+            [_tc(gyro[2 * i] << 8 | gyro[2 * i + 1]) for i in range(3)]
+        ]
+
+    def set_offsets(self, accel=None, gyro=None):
+        """
+    .. method:: set_offsets(accel=None, gyro=None)
+
+        :param accel: is the list of the X, Y and Z accelerometer offsets (+-16g format). If None, they are left unchanged.
+        :param gyro: is the list of the X, Y and Z gyroscope offsets (+-1000dps format). If None, they are left unchanged.
+
+        Write the hardware offset registers, 6 bytes with a single transaction for each sensor.
+        The offsets are added by the sensor to every sample, FIFO included.
+        The reserved bit 0 of the accelerometer offsets is preserved. Offsets must be in the signed 16-bit range.
+
+        """
+        if (accel is not None):
+            if (len(accel) != 3):
+                raise ValueError
+            for i in range(3):
+                if (accel[i] < -32768 or accel[i] > 32767):
+                    raise ValueError
+            current = self.write_read(XA_OFFS_H, n=6)
+            data = bytearray(6)
+            for i in range(3):
+                v = (accel[i] & 0xFFFE) | (current[2 * i + 1] & 1)
+                data[2 * i] = (v >> 8) & 0xFF
+                data[2 * i + 1] = v & 0xFF
+            self.write_bytes(XA_OFFS_H, *data)
+
+        if (gyro is not None):
+            if (len(gyro) != 3):
+                raise ValueError
+            data = bytearray(6)
+            for i in range(3):
+                if (gyro[i] < -32768 or gyro[i] > 32767):
+                    raise ValueError
+                v = gyro[i] & 0xFFFF
+                data[2 * i] = v >> 8
+                data[2 * i + 1] = v & 0xFF
+            self.write_bytes(XG_OFFS_USRH, *data)
+
+    def calibrate(self, samples=200):
+        """
+    .. method:: calibrate(samples=200)
+
+        :param samples: is the number of samples averaged to estimate the biases.
+
+        Estimate the accelerometer and gyroscope biases and compensate them in the hardware offset registers,
+        so that the values read from the sensor (raw counts and FIFO frames included) are already corrected.
+        The sensor must lie still and flat, with the Z axis pointing up (+1g on Z) during the calibration.
+
+        Samples are read with a single burst each, at the configured sample rate. Every axis must be powered on:
+        it can not be called with axes in standby (see :meth:`set_active_axes`), in low power cycle mode or while
+        the gyroscopes are gated.
+        Return the estimated biases in raw counts at the current full-scale ranges, in a list [accel, gyro]
+        of X, Y and Z lists.
+
+        """
+        if (samples <= 0):
+            raise ValueError
+        # axes powered off read as 0 and would be compensated as huge biases
+        if (self._low_power or self._gyro_gated or self._active != 0b1111111):
+            raise ValueError
+
+        period = int(1000 / self.get_sample_rate() + 0.5)
+        if (period < 1):
+            period = 1
+
+        sums = [0, 0, 0, 0, 0, 0, 0]
+        raw = [0, 0, 0, 0, 0, 0, 0]
+        for i in range(samples):
+            self.read_raw(raw)
+            for j in range(7):
+                sums[j] += raw[j]
+            sleep(period)
+
+        accel_sensitivity = 1 / self._accel_scale_g
+        gyro_sensitivity = 1 / self._gyro_scale
+
+        # expected values: 0 on every axis except +1g on accelerometer Z
+        accel_bias = [sums[0] / samples, sums[1] / samples, sums[2] / samples - accel_sensitivity]
+        gyro_bias = [sums[4] / samples, sums[5] / samples, sums[6] / samples]
+
+        accel_offs, gyro_offs = self.get_offsets()
+        for i in range(3):
+            # bit 0 of the accelerometer offsets is reserved: round to the nearest even value
+            accel_offs[i] = _clamp16(accel_offs[i] - 2 * _round(accel_bias[i] * ACCEL_OFFS_SENSITIVITY / accel_sensitivity / 2))
+            gyro_offs[i] = _clamp16(gyro_offs[i] - _round(gyro_bias[i] * GYRO_OFFS_SENSITIVITY / gyro_sensitivity))
+        self.set_offsets(accel_offs, gyro_offs)
+
+        return [accel_bias, gyro_bias]
+
+    def configure(self, clock=None, accel_fullscale=None, gyro_fullscale=None, dlpf=None, dhpf=None, sample_rate=None, sleep=None):
+        """
+    .. method:: configure(clock=None, accel_fullscale=None, gyro_fullscale=None, dlpf=None, dhpf=None, sample_rate=None, sleep=None)
+
+        :param clock: is the clock source (see :meth:`set_clock_source`).
+        :param accel_fullscale: is the accelerometer full-scale range (see :meth:`set_accel_fullscale`).
+        :param gyro_fullscale: is the gyroscope full-scale range (see :meth:`set_gyro_fullscale`).
+        :param dlpf: is the DLPF mode (see :meth:`set_dlpf_mode`).
+        :param dhpf: is the DHPF mode (see :meth:`set_dhpf_mode`).
+        :param sample_rate: is the sample rate in Hz (see :meth:`set_sample_rate`), computed with the new DLPF mode.
+        :param sleep: is the state of Sleep Mode (see :meth:`set_sleep_mode`).
+
+        Apply several settings at once: the new register values are built in memory and consecutive registers
+        (SMPLRT_DIV, CONFIG, GYRO_CONFIG and ACCEL_CONFIG) are written with a single transaction, followed by
+        PWR_MGMT_1 if needed. Settings left to None are not changed.
+
+        Return the sample rate actually set when *sample_rate* is given, otherwise None.
+
+        """
+        if (clock is not None and clock not in [0, 1, 2, 3, 4, 5, 7]):
+            raise ValueError
+        if (accel_fullscale is not None and accel_fullscale not in [2, 4, 8, 16]):
+            raise ValueError
+        if (gyro_fullscale is not None and gyro_fullscale not in [250, 500, 1000, 2000]):
+            raise ValueError
+        if (dlpf is not None and dlpf not in [0, 1, 2, 3, 4, 5, 6, 7]):
+            raise ValueError
+        if (dhpf is not None and dhpf not in [0, 1, 2, 3, 4, 7]):
+            raise ValueError
+        if (sample_rate is not None and sample_rate <= 0):
+            raise ValueError
+        if (sleep is not None and sleep != True and sleep != False):
+            raise ValueError
+
+        # span of the touched registers among SMPLRT_DIV..ACCEL_CONFIG
+        first = ACCEL_CONFIG + 1
+        last = REG_SMPLRT_DIV - 1
+        if (sample_rate is not None):
+            first = REG_SMPLRT_DIV
+        if (dlpf is not None or sample_rate is not None):
+            first = min(first, REG_CONFIG)
+            last = REG_CONFIG
+        if (gyro_fullscale is not None):
+            first = min(first, GYRO_CONFIG)
+            last = GYRO_CONFIG
+        if (accel_fullscale is not None or dhpf is not None):
+            first = min(first, ACCEL_CONFIG)
+            last = ACCEL_CONFIG
+
+        rate = None
+        if (first <= last):
+            # current values, from the shadow cache or with a single burst read
+            if (self._cache is not None and self._cache_valid and first != REG_SMPLRT_DIV):
+                regs = bytearray(last - first + 1)
+                for i in range(len(regs)):
+                    regs[i] = self._read_reg(first + i)
+            else:
+                regs = bytearray(self.write_read(first, n=last - first + 1))
+
+            if (dlpf is not None or sample_rate is not None):
+                i = REG_CONFIG - first
+                if (dlpf is not None):
+                    regs[i] = (regs[i] & 0b11111000) | dlpf
+                if (sample_rate is not None):
+                    regs[0], rate = self._compute_divider(regs[i] & 0b111, sample_rate)
+            if (gyro_fullscale is not None):
+                i = GYRO_CONFIG - first
+                regs[i] = (regs[i] & 0b11100111) | (self.gyro_fullscale[str(gyro_fullscale)] << 3)
+            if (accel_fullscale is not None or dhpf is not None):
+                i = ACCEL_CONFIG - first
+                if (accel_fullscale is not None):
+                    regs[i] = (regs[i] & 0b11100111) | (self.accel_fullscale[str(accel_fullscale)] << 3)
+                if (dhpf is not None):
+                    regs[i] = (regs[i] & 0b11111000) | dhpf
+
+            self._write_block(first, regs)
+
+            if (gyro_fullscale is not None):
+                self._update_gyro_scale(self.gyro_fullscale[str(gyro_fullscale)])
+            if (accel_fullscale is not None):
+                self._update_accel_scale(self.accel_fullscale[str(accel_fullscale)])
+
+        if (clock is not None or sleep is not None):
+            value = self._read_reg(PWR_MGMT_1)
+            if (clock is not None):
+                value = (value & 0b11111000) | clock
+            if (sleep is not None):
+                if (sleep):
+                    value |= (1 << 6)
+                else:
+                    value &= ~(1 << 6)
+            self._write_reg(PWR_MGMT_1, value)
+
+        return rate
+
+    def export_profile(self):
+        """
+    .. method:: export_profile()
+
+        Return the calibration and configuration of the sensor packed in a ``PROFILE_SIZE`` bytes bytearray,
+        to be stored (e.g. in flash) and later restored with :meth:`apply_profile` or the *profile* parameter of the constructor.
+
+        The profile holds the hardware offsets, the sample rate divider, the DLPF and DHPF modes, the full-scale ranges
+        and the interrupt setup (INT_PIN_CFG and INT_ENABLE registers).
+
+        """
+        profile = bytearray(PROFILE_SIZE)
+        profile[0] = PROFILE_MAGIC
+        profile[1] = PROFILE_VERSION
+        profile[2:8] = self.write_read(XA_OFFS_H, n=6)
+        profile[8:14] = self.write_read(XG_OFFS_USRH, n=6)
+        # SMPLRT_DIV, CONFIG, GYRO_CONFIG and ACCEL_CONFIG are consecutive
+        profile[14:18] = self.write_read(REG_SMPLRT_DIV, n=4)
+        # INT_PIN_CFG and INT_ENABLE are consecutive
+        profile[18:20] = self.write_read(REG_INT_PIN_CFG, n=2)
+        return profile
+
+    def apply_profile(self, profile):
+        """
+    .. method:: apply_profile(profile)
+
+        :param profile: is a profile returned by :meth:`export_profile`.
+
+        Restore the calibration and configuration stored in *profile* with 4 transactions, skipping a new calibration.
+
+        """
+        if (len(profile) != PROFILE_SIZE or profile[0] != PROFILE_MAGIC or profile[1] != PROFILE_VERSION):
+            raise ValueError
+
+        self.write_bytes(XA_OFFS_H, *profile[2:8])
+        self.write_bytes(XG_OFFS_USRH, *profile[8:14])
+        self._write_block(REG_SMPLRT_DIV, profile[14:18])
+        self._write_block(REG_INT_PIN_CFG, profile[18:20])
+
+        self._update_gyro_scale((profile[16] >> 3) & 0b11)
+        self._update_accel_scale((profile[17] >> 3) & 0b11)
+        self._int_active_low = ((profile[18] >> 7) & 1) == 1
+        self._int_open_drain = ((profile[18] >> 6) & 1) == 1
 
     ##
     ## @brief      Set the value of the register in the position indicated, according to the param state.
@@ -529,14 +1559,14 @@ class MPU6050(i2c.I2C):
         if (pos < 0):
             raise ValueError
 
-        value = self.write_read(reg, n=1)[0]
+        value = self._read_reg(reg)
 
         if (state):
             value |= (1 << pos)
         else: 
             value &= ~(1 << pos)
 
-        self.write_bytes(reg, value)
+        self._write_reg(reg, value)
 
     ##
     ## @brief      Set delay to detect motion, according to the value of param delay.
@@ -549,10 +1579,10 @@ class MPU6050(i2c.I2C):
         if (delay < 0 or delay > 3):
             raise ValueError
 
-        value = self.write_read(REG_MOT_DETECT_CTRL, n=1)[0]
+        value = self._read_reg(REG_MOT_DETECT_CTRL)
         value &= 0b11001111
         value |= (delay << 4)
-        self.write_bytes(REG_MOT_DETECT_CTRL, value)
+        self._write_reg(REG_MOT_DETECT_CTRL, value)
     
     ##
     ## @brief      Set the bit FF_EN of INT_ENABLE register, according to the value of param state.
@@ -648,27 +1678,277 @@ class MPU6050(i2c.I2C):
 
         self.write_bytes(REG_ZMOT_DURATION, duration)
     
+    def poll_events(self):
+        """
+    .. method:: poll_events()
+
+        Read INT_STATUS register once and latch its flags in the software event set, where they stay until consumed
+        with :meth:`consume_events`. Since INT_STATUS is cleared on read, this lets different parts of the application
+        check their own events without losing the others. Return the flags read.
+
+        The events are:
+
+        ======================== =========================
+         event                    meaning
+        ======================== =========================
+         EVENT_DATA_READY          new data is ready
+         EVENT_DMP                 DMP interrupt
+         EVENT_I2C_MASTER          I2C master interrupt
+         EVENT_FIFO_OVERFLOW       FIFO overflow
+         EVENT_ZERO_MOTION         zero motion detected
+         EVENT_MOTION              motion detected
+         EVENT_FREE_FALL           free fall detected
+        ======================== =========================
+
+        """
+        status = self.write_read(REG_INT_STATUS, n=1)[0]
+        self._events |= status
+        return status
+
+    def get_events(self):
+        """
+    .. method:: get_events()
+
+        Return the latched events, without consuming them and without reading the sensor.
+
+        """
+        return self._events
+
+    def consume_events(self, mask=0xFF):
+        """
+    .. method:: consume_events(mask=0xFF)
+
+        :param mask: is the set of events to consume (e.g. ``EVENT_MOTION | EVENT_FREE_FALL``), default all of them.
+
+        Return the latched events in *mask* and clear them from the event set.
+
+        """
+        events = self._events & mask
+        self._events &= ~mask
+        return events
+
+    ##
+    ## @brief      Check and consume an event, reading INT_STATUS only if the event is not already latched.
+    ##
+    ## @param      self
+    ## @param      event    is the event to check.
+    ## @return     1 if the event occurred, otherwise 0.
+    ##
+    def _check_event(self, event):
+        if (not (self._events & event)):
+            self.poll_events()
+        if (self.consume_events(event)):
+            return 1
+        return 0
+
+    ##
+    ## @brief      Build the motion event dictionary returned by get_motion_event.
+    ##
+    ## @param      self
+    ## @param      events   are the consumed motion and zero motion events.
+    ## @param      status   is the value of MOT_DETECT_STATUS register.
+    ## @return     the motion event dictionary.
+    ##
+    def _decode_motion_event(self, events, status):
+        x = 0
+        y = 0
+        z = 0
+        if (status & MOT_X_POS):
+            x = 1
+        elif (status & MOT_X_NEG):
+            x = -1
+        if (status & MOT_Y_POS):
+            y = 1
+        elif (status & MOT_Y_NEG):
+            y = -1
+        if (status & MOT_Z_POS):
+            z = 1
+        elif (status & MOT_Z_NEG):
+            z = -1
+
+        return {
+            'motion': (events >> 6) & 1,
+            'zero_motion': (events >> 5) & 1,
+            'still': status & MOT_ZRMOT,
+            'x': x,
+            'y': y,
+            'z': z,
+            'status': status
+        }
+
+    def get_motion_event(self, raw=None):
+        """
+    .. method:: get_motion_event(raw=None)
+
+        :param raw: is an optional preallocated buffer of at least 7 items, filled with the raw counts of the current sample (see :meth:`read_raw`).
+
+        Read INT_STATUS and MOT_DETECT_STATUS registers with a single burst (0x3A..0x61, data registers included),
+        latch the interrupt flags (see :meth:`poll_events`) and consume the motion and zero motion events.
+
+        Return None when no motion or zero motion event occurred, otherwise a dictionary:
+
+        ============== ===========================================================================
+         key            value
+        ============== ===========================================================================
+         motion         1 if a motion has been detected, otherwise 0
+         zero_motion    1 if a zero motion event occurred, otherwise 0
+         still          1 if the zero motion event is an entry (the sensor became still), 0 if an exit
+         x, y, z        1 or -1 if the motion was detected on the positive or negative direction of the axis, otherwise 0
+         status         the raw value of MOT_DETECT_STATUS register
+        ============== ===========================================================================
+
+        """
+        data = self.write_read(REG_INT_STATUS, n=REG_MOT_DETECT_STATUS - REG_INT_STATUS + 1)
+        self._events |= data[0]
+        status = data[REG_MOT_DETECT_STATUS - REG_INT_STATUS]
+
+        if (raw is not None):
+            for i in range(7):
+                if (self._span_active & (1 << i)):
+                    raw[i] = _tc(data[1 + 2 * i] << 8 | data[2 + 2 * i])
+                else:
+                    raw[i] = 0
+
+        events = self.consume_events(EVENT_MOTION | EVENT_ZERO_MOTION)
+        if (not events):
+            return None
+        return self._decode_motion_event(events, status)
+
     def is_motion_detected(self):
         """
     .. method:: is_motion_detected()
 
         Return 1 if a motion has been detected, otherwise 0.
+        The motion event is consumed, the other events stay latched (see :meth:`poll_events`).
         
         """
-        data = self.write_read(REG_INT_STATUS, n=1)[0]
-        is_activity = ((data >> 6) & 1)
-        return is_activity
+        return self._check_event(EVENT_MOTION)
     
     def is_data_ready(self):
         """
     .. method:: is_data_ready()
 
         Return 1 if data is ready, otherwise 0.
+        The data ready event is consumed, the other events stay latched (see :meth:`poll_events`).
         
         """
-        data = self.write_read(REG_INT_STATUS, n=1)[0]
-        is_ready = ((data >> 0) & 1)
-        return is_ready
+        return self._check_event(EVENT_DATA_READY)
+
+    def set_interrupt_config(self, active_low=False, open_drain=False, latch=False, rd_clear=False):
+        """
+    .. method:: set_interrupt_config(active_low=False, open_drain=False, latch=False, rd_clear=False)
+
+        :param active_low: if True, the INT pin is active low, otherwise active high.
+        :param open_drain: if True, the INT pin is configured as open drain, otherwise push-pull.
+        :param latch: if True, the INT pin is held active until the interrupt is cleared, otherwise it emits a 50us pulse.
+        :param rd_clear: if True, the interrupt status is cleared by any read operation, otherwise only by reading INT_STATUS (default, power-on value).
+
+        Set the behaviour of the INT pin (INT_PIN_CFG register).
+
+        With *rd_clear* True every data read (e.g. :meth:`get_values`) clears the motion, zero motion and FIFO overflow
+        flags before they can be latched, so it can not be used together with :meth:`poll_events`, :meth:`get_motion_event`
+        or the FIFO overflow recovery of :meth:`read_fifo`.
+
+        """
+        if (active_low != True and active_low != False):
+            raise ValueError
+        if (open_drain != True and open_drain != False):
+            raise ValueError
+        if (latch != True and latch != False):
+            raise ValueError
+        if (rd_clear != True and rd_clear != False):
+            raise ValueError
+
+        # keep I2C_BYPASS_EN and FSYNC settings
+        value = self.write_read(REG_INT_PIN_CFG, n=1)[0]
+        value &= 0b00001111
+        if (active_low):
+            value |= (1 << 7)
+        if (open_drain):
+            value |= (1 << 6)
+        if (latch):
+            value |= (1 << 5)
+        if (rd_clear):
+            value |= (1 << 4)
+        self.write_bytes(REG_INT_PIN_CFG, value)
+
+        self._int_active_low = active_low
+        self._int_open_drain = open_drain
+
+    ##
+    ## @brief      Set the bit DATA_RDY_EN of INT_ENABLE register, according to the value of param state.
+    ##             When set to 1, this bit enables the Data Ready interrupt.
+    ##
+    ## @param      self
+    ## @param      state    boolean value to set the bit DATA_RDY_EN of INT_ENABLE register.
+    ## @return     nothing
+    ##
+    def set_data_ready(self, state):
+        if (state != True and state != False):
+            raise ValueError
+
+        self.write_register_bit(REG_INT_ENABLE, 0, state)
+
+    ##
+    ## @brief      Handler of the INT pin edge: read the sensor and pass the values to the data ready callback.
+    ##
+    ## @param      self
+    ## @return     nothing
+    ##
+    def _on_int_pin(self):
+        callback = self._drdy_callback
+        if (callback is not None):
+            # reading INT_STATUS releases a latched INT pin, the other flags stay latched in the event set
+            self.poll_events()
+            self.consume_events(EVENT_DATA_READY)
+            callback(self.get_values(self._drdy_g))
+
+    def on_data_ready(self, pin, callback, g=False):
+        """
+    .. method:: on_data_ready(pin, callback, g=False)
+
+        :param pin: is the GPIO pin connected to the INT pin of the sensor.
+        :param callback: is the function called with the list [temp, accel, gyro] (see :meth:`get_values`) each time new data is ready.
+                         If None, the Data Ready interrupt is disabled.
+        :param g: is the format of accelerometer values passed to the callback.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Enable the Data Ready interrupt and read the sensor only when the INT pin signals new data, instead of polling :meth:`is_data_ready`.
+        The pin edge is chosen according to the polarity set with :meth:`set_interrupt_config`.
+        At each edge INT_STATUS is read (see :meth:`poll_events`) before the data, so that a latched INT pin
+        (``latch=True``) is released and the next data ready event raises a new edge. ::
+
+            def print_values(values):
+                print(values)
+
+            mpu.on_data_ready(D2, print_values)
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        if (callback is None):
+            self.set_data_ready(False)
+            self._drdy_callback = None
+            handler = None
+        else:
+            self._drdy_callback = callback
+            self._drdy_g = g
+            handler = self._on_int_pin
+
+        if (self._int_open_drain):
+            pinMode(pin, INPUT_PULLUP)
+        else:
+            pinMode(pin, INPUT)
+
+        if (self._int_active_low):
+            onPinFall(pin, handler)
+        else:
+            onPinRise(pin, handler)
+
+        if (callback is not None):
+            self.set_data_ready(True)
 
     def setup_motion(self):
         """
@@ -685,4 +1965,466 @@ class MPU6050(i2c.I2C):
         self.set_motion_detection_threshold(THRESHOLD)
         self.set_motion_detection_duration(DURATION)
         self.set_zero_motion_detection_threshold(ZDURATION)
-        self.set_zero_motion_detection_duration(ZTHRESHOLD)
\ No newline at end of file
+        self.set_zero_motion_detection_duration(ZTHRESHOLD)
+
+    def set_gyro_gating(self, state):
+        """
+    .. method:: set_gyro_gating(state)
+
+        :param state: if True, the gyroscopes are gated by the zero motion detection, otherwise the gating is disabled.
+
+        Enable or disable the managed gyroscope gating: with the gating enabled, :meth:`update_gyro_gating` puts the
+        active gyroscopes in standby when the sensor becomes still and enables them again when it starts moving.
+        Zero motion and motion detection interrupts are enabled; thresholds, durations and the high pass filter
+        must be configured too (see :meth:`setup_motion`).
+
+        When the gating is disabled, the gyroscopes are enabled again if they are in standby and the motion and
+        zero motion interrupts are restored to their previous state.
+
+        """
+        if (state != True and state != False):
+            raise ValueError
+        if (state and self._low_power):
+            raise ValueError
+        if (state == self._gating):
+            return
+
+        if (state):
+            self._gate_int = self._read_reg(REG_INT_ENABLE) & 0b01100000
+            self.set_zero_motion(True)
+            self.set_motion(True)
+        else:
+            if (self._gyro_gated):
+                self._resume_gyro()
+            self.set_zero_motion((self._gate_int & (1 << 5)) != 0)
+            self.set_motion((self._gate_int & (1 << 6)) != 0)
+        self._gating = state
+
+    def is_gyro_gated(self):
+        """
+    .. method:: is_gyro_gated()
+
+        Return True if the gyroscopes are in standby because the sensor is still (see :meth:`set_gyro_gating`), otherwise False.
+
+        """
+        return self._gyro_gated
+
+    ##
+    ## @brief      Put the active gyroscopes in standby and switch to the internal oscillator.
+    ##
+    ## @param      self
+    ## @return     nothing
+    ##
+    def _gate_gyro(self):
+        # the PLL can not use a gyroscope in standby as reference
+        pwr1 = self._read_reg(PWR_MGMT_1)
+        self._gate_clock = pwr1 & 0b00000111
+        self._write_reg(PWR_MGMT_1, pwr1 & 0b11111000)
+
+        # STBY_XG, STBY_YG, STBY_ZG
+        pwr2 = self._read_reg(PWR_MGMT_2)
+        self._write_reg(PWR_MGMT_2, pwr2 | 0b00000111)
+        self._gyro_gated = True
+        # the burst reads skip the gyroscopes
+        self._update_span(self._active & 0b0001111)
+
+    ##
+    ## @brief      Enable the active gyroscopes again, restore the clock source and wait for the gyroscopes to start up.
+    ##
+    ## @param      self
+    ## @return     nothing
+    ##
+    def _resume_gyro(self):
+        # gyroscopes in standby for set_active_axes stay in standby
+        pwr2 = self._read_reg(PWR_MGMT_2)
+        pwr2 &= 0b11111000
+        for i in range(3):
+            if (not (self._active & (1 << (4 + i)))):
+                pwr2 |= (1 << (2 - i))
+        self._write_reg(PWR_MGMT_2, pwr2)
+
+        pwr1 = self._read_reg(PWR_MGMT_1)
+        self._write_reg(PWR_MGMT_1, (pwr1 & 0b11111000) | self._gate_clock)
+        self._gyro_gated = False
+        self._update_span(self._active)
+        # PLL settle time
+        sleep(GYRO_START_TIME)
+
+    def update_gyro_gating(self):
+        """
+    .. method:: update_gyro_gating()
+
+        Check the motion events and, when the gating is enabled (see :meth:`set_gyro_gating`), gate the gyroscopes:
+
+        * on a zero motion entry, the gyroscopes are put in standby and the clock source is switched to the internal oscillator;
+        * on a zero motion exit or a motion event, the gyroscopes and the clock source are restored and the method
+          waits for the gyroscopes to start up.
+
+        Only INT_STATUS is read at each call (see :meth:`poll_events`), MOT_DETECT_STATUS is read only when a motion
+        or zero motion event is pending; the motion and zero motion events are consumed.
+
+        Return ``GYRO_GATED`` or ``GYRO_RESUMED`` on a transition, otherwise 0. While the gyroscopes are gated
+        the integration of the angular rate (e.g. the sensor fusion) should be paused and no sample needs to be read. ::
+
+            mpu.setup_motion()
+            mpu.set_gyro_gating(True)
+
+            raw = [0] * 7
+            while True:
+                mpu.update_gyro_gating()
+                if not mpu.is_gyro_gated():
+                    ahrs.update(mpu.read_raw(raw))
+                sleep(10)
+
+        """
+        if (not (self._events & (EVENT_MOTION | EVENT_ZERO_MOTION))):
+            self.poll_events()
+        events = self.consume_events(EVENT_MOTION | EVENT_ZERO_MOTION)
+        if (not events):
+            return 0
+        status = self.write_read(REG_MOT_DETECT_STATUS, n=1)[0]
+        event = self._decode_motion_event(events, status)
+        if (not self._gating or self._low_power):
+            return 0
+
+        if (not self._gyro_gated):
+            if (event['zero_motion'] and event['still']):
+                self._gate_gyro()
+                return GYRO_GATED
+        elif (event['motion'] or (event['zero_motion'] and not event['still'])):
+            self._resume_gyro()
+            return GYRO_RESUMED
+        return 0
+
+    def set_fifo_channels(self, accel=True, temp=False, gyro=True):
+        """
+    .. method:: set_fifo_channels(accel=True, temp=False, gyro=True)
+
+        :param accel: if True, the accelerometer X, Y and Z values are written into the FIFO.
+        :param temp: if True, the temperature value is written into the FIFO.
+        :param gyro: if True, the gyroscope X, Y and Z values are written into the FIFO.
+
+        Select which channels are written into the FIFO at each sample.
+        Every FIFO frame holds the selected channels in register order (accel, temp, gyro).
+
+        """
+        if (accel != True and accel != False):
+            raise ValueError
+        if (temp != True and temp != False):
+            raise ValueError
+        if (gyro != True and gyro != False):
+            raise ValueError
+
+        value = 0
+        frame_size = 0
+        if (temp):
+            value |= (1 << 7)
+            frame_size += 2
+        if (gyro):
+            value |= (0b111 << 4)
+            frame_size += 6
+        if (accel):
+            value |= (1 << 3)
+            frame_size += 6
+        self.write_bytes(REG_FIFO_EN, value)
+
+        self._fifo_accel = accel
+        self._fifo_temp = temp
+        self._fifo_gyro = gyro
+        self._fifo_frame_size = frame_size
+
+    def get_fifo_frame_size(self):
+        """
+    .. method:: get_fifo_frame_size()
+
+        Return the size in bytes of a FIFO frame, according to the channels set with :meth:`set_fifo_channels`.
+
+        """
+        return self._fifo_frame_size
+
+    def set_fifo_frame_size(self, size):
+        """
+    .. method:: set_fifo_frame_size(size)
+
+        :param size: is the size in bytes of the frames written into the FIFO.
+
+        Set the size of the FIFO frames when they are not written by the raw channels of :meth:`set_fifo_channels`
+        (e.g. the DMP packets), so that :meth:`read_fifo` drains whole frames and resynchronizes on overflow.
+
+        """
+        if (size < 0 or size > FIFO_SIZE):
+            raise ValueError
+
+        self._fifo_frame_size = size
+
+    def get_fifo_channels(self):
+        """
+    .. method:: get_fifo_channels()
+
+        Return the channels written into the FIFO (see :meth:`set_fifo_channels`) in a list [accel, temp, gyro] of booleans.
+
+        """
+        return [self._fifo_accel, self._fifo_temp, self._fifo_gyro]
+
+    def enable_fifo(self, state):
+        """
+    .. method:: enable_fifo(state)
+
+        :param state: if True, the FIFO is reset (pending overflow flag included) and enabled, otherwise it is disabled.
+
+        Enable or disable the FIFO buffer.
+
+        """
+        if (state != True and state != False):
+            raise ValueError
+
+        if (state):
+            # reset the FIFO so that it starts on a frame boundary
+            self._reset_fifo(True)
+        else:
+            self.write_register_bit(REG_USER_CTRL, 6, False)
+
+    ##
+    ## @brief      Reset the FIFO buffer: FIFO_EN is cleared, FIFO_RESET is set and then FIFO_EN is set again if requested.
+    ##
+    ## @param      self
+    ## @param      enable   if True, the FIFO is enabled after the reset.
+    ## @return     nothing
+    ##
+    def _reset_fifo(self, enable):
+        value = self._read_reg(REG_USER_CTRL) & ~((1 << 6) | (1 << 2))
+        # FIFO_RESET works only while FIFO_EN is 0
+        self._write_reg(REG_USER_CTRL, value)
+        # FIFO_RESET bit is automatically cleared by the sensor
+        self._write_reg(REG_USER_CTRL, value | (1 << 2))
+        if (enable):
+            self._write_reg(REG_USER_CTRL, value | (1 << 6))
+        # an overflow flag raised before the reset refers to the discarded content
+        self.poll_events()
+        self.consume_events(EVENT_FIFO_OVERFLOW)
+
+    def reset_fifo(self):
+        """
+    .. method:: reset_fifo()
+
+        Discard the content of the FIFO buffer. The FIFO is disabled during the reset and enabled again
+        if it was enabled.
+
+        """
+        self._reset_fifo((self._read_reg(REG_USER_CTRL) >> 6) & 1 == 1)
+
+    def get_fifo_count(self):
+        """
+    .. method:: get_fifo_count()
+
+        Return the number of bytes stored in the FIFO buffer.
+
+        """
+        data = self.write_read(REG_FIFO_COUNTH, n=2)
+        return (data[0] << 8) | data[1]
+
+    ##
+    ## @brief      Check the FIFO_OFLOW_INT bit of INT_STATUS register and, on overflow,
+    ##             discard the FIFO content and restart it aligned on a frame boundary.
+    ##
+    ## @param      self
+    ## @return     the number of frames dropped, 0 when the FIFO did not overflow.
+    ##
+    def _recover_fifo_overflow(self):
+        if (not self.check_fifo_overflow()):
+            return 0
+
+        # The oldest frames have been overwritten and the frame boundaries are lost:
+        # everything still in the FIFO is dropped (at least one frame went missing)
+        dropped = self.get_fifo_count() // self._fifo_frame_size
+        if (dropped == 0):
+            dropped = 1
+        self.enable_fifo(True)
+
+        self.add_fifo_gap(dropped)
+        return dropped
+
+    def check_fifo_overflow(self):
+        """
+    .. method:: check_fifo_overflow()
+
+        Check and clear the FIFO overflow flag (see :meth:`poll_events`), accounting the overflow in :meth:`get_fifo_stats`.
+        The FIFO is not restarted: its content is misaligned and must be discarded (see :meth:`enable_fifo`).
+
+        Return True if the FIFO overflowed since the last check, otherwise False.
+
+        """
+        if (not self._check_event(EVENT_FIFO_OVERFLOW)):
+            return False
+        self._fifo_overflows += 1
+        return True
+
+    def add_fifo_gap(self, frames):
+        """
+    .. method:: add_fifo_gap(frames)
+
+        :param frames: is the number of frames discarded.
+
+        Account *frames* discarded from the FIFO (e.g. on a restart) in the dropped frames of :meth:`get_fifo_stats`
+        and in the gap reported by :meth:`get_fifo_gap` for the next frames returned by :meth:`read_fifo`.
+
+        """
+        if (frames < 0):
+            raise ValueError
+
+        self._fifo_pending_gap += frames
+        self._fifo_dropped += frames
+
+    def get_fifo_gap(self):
+        """
+    .. method:: get_fifo_gap()
+
+        Return the number of frames lost to a FIFO overflow right before the frames returned by the last
+        :meth:`read_fifo` (or :meth:`fifo_values`) call, 0 when the data is contiguous with the previous read.
+
+        """
+        return self._fifo_gap
+
+    def get_fifo_stats(self):
+        """
+    .. method:: get_fifo_stats()
+
+        Return a list [overflows, dropped] with the number of FIFO overflows detected and the total number
+        of frames dropped since the sensor was created.
+
+        """
+        return [self._fifo_overflows, self._fifo_dropped]
+
+    def read_fifo(self, buf, count=None):
+        """
+    .. method:: read_fifo(buf, count=None)
+
+        :param buf: is a bytearray where the FIFO frames are stored.
+        :param count: is the number of bytes available in the FIFO. If None, it is read from the sensor.
+
+        Drain as many whole frames as fit in *buf* from the FIFO, reading up to ``FIFO_BURST_SIZE`` bytes per transaction.
+        Return the number of frames stored in *buf*.
+
+        When *count* is None, the FIFO overflow flag is checked first: on overflow the FIFO is reset and re-enabled,
+        no frame is returned and the number of frames lost is reported by :meth:`get_fifo_gap`.
+
+        """
+        frame_size = self._fifo_frame_size
+        if (frame_size == 0):
+            raise ValueError
+
+        if (count is None):
+            if (self._recover_fifo_overflow()):
+                self._fifo_gap = self._fifo_pending_gap
+                return 0
+            count = self.get_fifo_count()
+        if (count > len(buf)):
+            count = len(buf)
+        # read whole frames only, the remaining bytes stay in the FIFO
+        count -= count % frame_size
+
+        ofs = 0
+        while ofs < count:
+            n = count - ofs
+            if (n > FIFO_BURST_SIZE):
+                n = FIFO_BURST_SIZE
+            buf[ofs:ofs + n] = self.write_read(REG_FIFO_R_W, n=n)
+            ofs += n
+
+        # a gap is reported until the first frames following it have been returned
+        self._fifo_gap = self._fifo_pending_gap
+        if (count):
+            self._fifo_pending_gap = 0
+        return count // frame_size
+
+    def decode_fifo_frame(self, buf, ofs, g=False):
+        """
+    .. method:: decode_fifo_frame(buf, ofs, g=False)
+
+        :param buf: is the buffer filled by :meth:`read_fifo`.
+        :param ofs: is the offset of the frame inside *buf*.
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Decode the FIFO frame at offset *ofs* of *buf* into a list [temp, accel, gyro] like :meth:`get_values`.
+        Channels not written into the FIFO are None.
+
+        """
+        temp = None
+        accel = None
+        gyro = None
+
+        if (self._fifo_accel):
+            if g is True:
+                scale = self._accel_scale_g
+            else:
+                scale = self._accel_scale_ms2
+            accel = {
+                'x': _tc(buf[ofs] << 8 | buf[ofs + 1]) * scale,
+                'y': _tc(buf[ofs + 2] << 8 | buf[ofs + 3]) * scale,
+                'z': _tc(buf[ofs + 4] << 8 | buf[ofs + 5]) * scale
+            }
+            ofs += 6
+        if (self._fifo_temp):
+            temp = (_tc(buf[ofs] << 8 | buf[ofs + 1]) / 340) + 36.53
+            ofs += 2
+        if (self._fifo_gyro):
+            scale = self._gyro_scale
+            gyro = {
+                'x': _tc(buf[ofs] << 8 | buf[ofs + 1]) * scale,
+                'y': _tc(buf[ofs + 2] << 8 | buf[ofs + 3]) * scale,
+                'z': _tc(buf[ofs + 4] << 8 | buf[ofs + 5]) * scale
+            }
+
+        return [temp, accel, gyro]
+
+    def decode_fifo_raw(self, buf, ofs, raw):
+        """
+    .. method:: decode_fifo_raw(buf, ofs, raw)
+
+        :param buf: is the buffer filled by :meth:`read_fifo`.
+        :param ofs: is the offset of the frame inside *buf*.
+        :param raw: is a preallocated buffer of at least 7 items.
+
+        Store the raw counts of the FIFO frame at offset *ofs* of *buf* in *raw*, in the order of :meth:`read_raw`
+        (accel X, Y, Z, temp, gyro X, Y, Z), without any conversion. Channels not written into the FIFO are 0.
+        Return *raw*.
+
+        """
+        for i in range(7):
+            raw[i] = 0
+        if (self._fifo_accel):
+            for i in range(3):
+                raw[i] = _tc(buf[ofs] << 8 | buf[ofs + 1])
+                ofs += 2
+        if (self._fifo_temp):
+            raw[3] = _tc(buf[ofs] << 8 | buf[ofs + 1])
+            ofs += 2
+        if (self._fifo_gyro):
+            for i in range(4, 7):
+                raw[i] = _tc(buf[ofs] << 8 | buf[ofs + 1])
+                ofs += 2
+        return raw
+
+    def fifo_values(self, buf, g=False):
+        """
+    .. method:: fifo_values(buf, g=False)
+
+        :param buf: is a bytearray used to drain the FIFO (see :meth:`read_fifo`).
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Drain the FIFO into *buf* and yield the decoded frames, oldest first, as lists [temp, accel, gyro]
+        like :meth:`get_values`. Channels not written into the FIFO are None.
+        Use :meth:`get_fifo_gap` to know whether frames were lost before the yielded ones.
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        frames = self.read_fifo(buf)
+        frame_size = self._fifo_frame_size
+        for i in range(frames):
+            yield self.decode_fifo_frame(buf, i * frame_size, g)
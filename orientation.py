@@ -0,0 +1,173 @@
+# Zerynth - libs - invensense-mpu6050/orientation.py
+#
+# Zerynth library for MPU6050 orientation estimation
+#
+# @Date: 2026-10-16
+
+"""
+.. module:: orientation
+
+******************
+Orientation Module
+******************
+
+This module contains a complementary filter fusing the accelerometer and gyroscope samples of the MPU6050 driver
+into roll, pitch and heading (yaw integrated from the Z angular rate, so it drifts over time).
+
+The filter works directly on raw counts, either one sample at a time (see :meth:`MPU6050.read_raw`) or on a block
+of frames drained from the FIFO (see :meth:`MPU6050.read_fifo`), and keeps its state in a few floats.
+
+"""
+
+import math
+
+
+class ComplementaryFilter():
+    """
+
+===========================
+ ComplementaryFilter class
+===========================
+
+.. class:: ComplementaryFilter(sensor, alpha=0.98)
+
+    Creates a complementary filter for the samples of *sensor*, an :class:`MPU6050` instance.
+
+    :param sensor: the sensor providing the samples, used for the gyroscope scale and the sample rate
+    :param alpha: weight of the gyroscope integration against the accelerometer angles, default 0.98
+
+    The sample period is read from the sensor when the filter is created: create a new filter (or call :meth:`set_dt`)
+    after changing the sample rate or the gyroscope full-scale range. ::
+
+        from invensense.mpu6050 import mpu6050
+        from invensense.mpu6050 import orientation
+
+        ...
+
+        mpu = mpu6050.MPU6050(I2C0)
+        mpu.set_sample_rate(100)
+        mpu.set_fifo_channels(accel=True, gyro=True)
+        mpu.enable_fifo(True)
+
+        cf = orientation.ComplementaryFilter(mpu)
+        buf = bytearray(240)
+        while True:
+            cf.update_fifo(buf, mpu.read_fifo(buf))
+            print(cf.get_orientation())
+            sleep(100)
+
+    """
+
+    def __init__(self, sensor, alpha=0.98):
+        if (alpha < 0 or alpha > 1):
+            raise ValueError
+
+        self.sensor = sensor
+        self.alpha = alpha
+        self._raw = [0, 0, 0, 0, 0, 0, 0]
+        self.set_dt(1 / sensor.get_sample_rate())
+        self.reset()
+
+    def set_dt(self, dt):
+        """
+    .. method:: set_dt(dt)
+
+        :param dt: is the sample period in seconds.
+
+        Set the sample period used by :meth:`update_fifo` and refresh the gyroscope scale from the sensor.
+
+        """
+        if (dt <= 0):
+            raise ValueError
+
+        self.dt = dt
+        self._gyro_scale = self.sensor.get_gyro_scale()
+
+    def reset(self, roll=0.0, pitch=0.0, yaw=0.0):
+        """
+    .. method:: reset(roll=0.0, pitch=0.0, yaw=0.0)
+
+        Reset the orientation to the given angles, in degrees.
+        When the orientation is reset, roll and pitch are initialized from the accelerometer at the next update.
+
+        """
+        self.roll = roll
+        self.pitch = pitch
+        self.yaw = yaw
+        self._init = False
+
+    ##
+    ## @brief      Update the orientation with a sample.
+    ##
+    ## @param      self
+    ## @param      ax, ay, az   raw accelerometer counts.
+    ## @param      gx, gy, gz   raw gyroscope counts.
+    ## @param      dt           time elapsed since the previous sample, in seconds.
+    ## @return     nothing
+    ##
+    def _update(self, ax, ay, az, gx, gy, gz, dt):
+        # accelerometer angles: the scale factor cancels out
+        acc_roll = math.degrees(math.atan2(ay, az))
+        acc_pitch = math.degrees(math.atan2(-ax, math.sqrt(ay * ay + az * az)))
+
+        if (not self._init):
+            self.roll = acc_roll
+            self.pitch = acc_pitch
+            self._init = True
+            return
+
+        k = self._gyro_scale * dt
+        alpha = self.alpha
+        self.roll = alpha * (self.roll + gx * k) + (1 - alpha) * acc_roll
+        self.pitch = alpha * (self.pitch + gy * k) + (1 - alpha) * acc_pitch
+        self.yaw += gz * k
+
+    def update(self, raw, dt=None):
+        """
+    .. method:: update(raw, dt=None)
+
+        :param raw: is the list of the seven raw counts of a sample (see :meth:`MPU6050.read_raw`).
+        :param dt: is the time elapsed since the previous sample, in seconds. If None, the sample period is used.
+
+        Update the orientation with a sample.
+
+        """
+        if (dt is None):
+            dt = self.dt
+        self._update(raw[0], raw[1], raw[2], raw[4], raw[5], raw[6], dt)
+
+    def update_fifo(self, buf, frames, dt=None):
+        """
+    .. method:: update_fifo(buf, frames, dt=None)
+
+        :param buf: is the buffer filled by :meth:`MPU6050.read_fifo`.
+        :param frames: is the number of frames stored in *buf*.
+        :param dt: is the time between two frames, in seconds. If None, the sample period is used.
+
+        Update the orientation with a block of FIFO frames, decoding the raw counts straight from *buf*.
+        Both accelerometer and gyroscope must be written into the FIFO (see :meth:`MPU6050.set_fifo_channels`).
+
+        """
+        sensor = self.sensor
+        accel, temp, gyro = sensor.get_fifo_channels()
+        if (not accel or not gyro):
+            raise ValueError
+        if (dt is None):
+            dt = self.dt
+
+        raw = self._raw
+        frame_size = sensor.get_fifo_frame_size()
+        ofs = 0
+        for i in range(frames):
+            sensor.decode_fifo_raw(buf, ofs, raw)
+            self._update(raw[0], raw[1], raw[2], raw[4], raw[5], raw[6], dt)
+            ofs += frame_size
+
+    def get_orientation(self):
+        """
+    .. method:: get_orientation()
+
+        Return the orientation in a list [roll, pitch, yaw], in degrees.
+
+        """
+        return [self.roll, self.pitch, self.yaw]
@@ -0,0 +1,657 @@
+# Zerynth - libs - invensense-mpu6050/sim.py
+#
+# Host-side simulation of the I2C bus and of the MPU6050 registers
+#
+# @Date: 2026-10-16
+
+"""
+.. module:: sim
+
+**********
+Sim Module
+**********
+
+This module lets the MPU6050 driver run on a workstation, without the Zerynth VM and without hardware.
+It provides a stand-in for the Zerynth ``i2c`` module, a simulated I2C bus that counts transactions, bytes
+and bus time, and a register-level model of the MPU6050 (WHO_AM_I, configuration registers, data registers,
+interrupt status, offset registers, FIFO and DMP memory) driven by synthetic or recorded motion.
+
+The simulated bus is passed to :class:`MPU6050` in place of the I2C driver name: ::
+
+    import sim
+    sim.install()
+
+    import mpu6050
+
+    bus = sim.SimBus()
+    model = bus.attach(sim.MPU6050Model(sim.stationary()))
+    mpu = mpu6050.MPU6050(bus)
+
+    bus.advance(10000)  # let 10ms of samples be produced
+    print(mpu.get_values())
+    print(bus.stats())
+
+The module is meant for CPython only and is never imported by the driver.
+
+"""
+
+import sys
+import math
+import builtins
+
+# Register addresses used by the model
+_SMPLRT_DIV = 0x19
+_CONFIG = 0x1A
+_GYRO_CONFIG = 0x1B
+_ACCEL_CONFIG = 0x1C
+_FIFO_EN = 0x23
+_INT_PIN_CFG = 0x37
+_INT_ENABLE = 0x38
+_INT_STATUS = 0x3A
+_ACCEL_XOUT_H = 0x3B
+_MOT_DETECT_STATUS = 0x61
+_USER_CTRL = 0x6A
+_PWR_MGMT_1 = 0x6B
+_PWR_MGMT_2 = 0x6C
+_FIFO_COUNTH = 0x72
+_FIFO_COUNTL = 0x73
+_FIFO_R_W = 0x74
+_BANK_SEL = 0x6D
+_MEM_START_ADDR = 0x6E
+_MEM_R_W = 0x6F
+_WHO_AM_I = 0x75
+
+_XA_OFFS_H = 0x06
+_XG_OFFS_USRH = 0x13
+
+_FIFO_SIZE = 1024
+_DMP_MEMORY_SIZE = 12 * 256
+
+_ACCEL_SENSITIVITY = (16384.0, 8192.0, 4096.0, 2048.0)
+_GYRO_SENSITIVITY = (131.0, 65.5, 32.8, 16.4)
+
+
+def _clamp16(v):
+    v = int(round(v))
+    if v > 32767:
+        return 32767
+    if v < -32768:
+        return -32768
+    return v
+
+
+def _s16(hi, lo):
+    v = (hi << 8) | lo
+    if v & 0x8000:
+        v -= 0x10000
+    return v
+
+
+def stationary(ax=0.0, ay=0.0, az=1.0, temp=25.0, gx=0.0, gy=0.0, gz=0.0):
+    """
+.. function:: stationary(ax=0.0, ay=0.0, az=1.0, temp=25.0, gx=0.0, gy=0.0, gz=0.0)
+
+    Return a motion source for a sensor lying still: constant acceleration (g), temperature (C) and angular rate (dps).
+
+    """
+    sample = (ax, ay, az, temp, gx, gy, gz)
+
+    def motion(index, t):
+        return sample
+    return motion
+
+
+def rotating(rate=90.0, axis=2, temp=25.0):
+    """
+.. function:: rotating(rate=90.0, axis=2, temp=25.0)
+
+    Return a motion source for a sensor spinning at a constant *rate* (dps) around *axis* (0=X, 1=Y, 2=Z),
+    with gravity rotating accordingly in the accelerometer readings.
+
+    """
+    def motion(index, t):
+        angle = math.radians(rate * t)
+        acc = [0.0, 0.0, 1.0]
+        gyro = [0.0, 0.0, 0.0]
+        gyro[axis] = rate
+        if axis == 0:
+            acc = [0.0, math.sin(angle), math.cos(angle)]
+        elif axis == 1:
+            acc = [-math.sin(angle), 0.0, math.cos(angle)]
+        return (acc[0], acc[1], acc[2], temp, gyro[0], gyro[1], gyro[2])
+    return motion
+
+
+def recording(samples, loop=True):
+    """
+.. function:: recording(samples, loop=True)
+
+    Return a motion source replaying *samples*, a sequence of (ax, ay, az, temp, gx, gy, gz) tuples in g, C and dps,
+    one per sensor sample. When *loop* is False the last sample is held once the recording ends.
+
+    """
+    n = len(samples)
+
+    def motion(index, t):
+        if loop:
+            return samples[index % n]
+        if index >= n:
+            return samples[-1]
+        return samples[index]
+    return motion
+
+
+class PeripheralError(Exception):
+    pass
+
+
+class MPU6050Model():
+    """
+.. class:: MPU6050Model(motion=None, bias=None)
+
+    Register-level model of an MPU6050.
+
+    :param motion: is the motion source, a function ``motion(index, t)`` returning the physical values
+                   (ax, ay, az, temp, gx, gy, gz) of sample *index* taken at time *t* (seconds). Default :func:`stationary`.
+    :param bias: is an optional tuple (ax, ay, az, gx, gy, gz) of raw count biases added to the outputs, as a real
+                 sensor would show before calibration.
+
+    Samples are produced at the output rate set by SMPLRT_DIV and CONFIG while time is advanced by the bus.
+    Each sample updates the data registers, raises DATA_RDY_INT and is pushed into the FIFO when enabled;
+    when the FIFO is full the oldest bytes are overwritten and FIFO_OFLOW_INT is raised.
+
+    """
+
+    def __init__(self, motion=None, bias=None):
+        if motion is None:
+            motion = stationary()
+        if bias is None:
+            bias = (0, 0, 0, 0, 0, 0)
+        self.motion = motion
+        self.bias = bias
+        self.regs = bytearray(128)
+        self.fifo = bytearray()
+        self.mem = bytearray(_DMP_MEMORY_SIZE)
+        self.samples = 0
+        self.time_us = 0
+        self._next_sample_us = 0
+        self._pointer = 0
+        # callback raised on the INT pin, see connect_int
+        self.int_handler = None
+        self._int_pending = False
+        self._in_int = False
+        # INT pin held by LATCH_INT_EN
+        self._int_asserted = False
+        self.reset()
+
+    def reset(self):
+        """
+    .. method:: reset()
+
+        Bring every register to its power-on value.
+
+        """
+        for i in range(len(self.regs)):
+            self.regs[i] = 0
+        self.regs[_WHO_AM_I] = 0x68
+        self.regs[_PWR_MGMT_1] = 0x40
+        self.fifo = bytearray()
+
+    def output_rate(self):
+        """
+    .. method:: output_rate()
+
+        Return the current sample rate in Hz.
+
+        """
+        if self.regs[_PWR_MGMT_1] & (1 << 5):
+            # low power cycle mode: LP_WAKE_CTRL wake-up frequency
+            return (1.25, 5, 20, 40)[self.regs[_PWR_MGMT_2] >> 6]
+        dlpf = self.regs[_CONFIG] & 0b111
+        gyro_rate = 8000 if dlpf in (0, 7) else 1000
+        return gyro_rate / (1 + self.regs[_SMPLRT_DIV])
+
+    def is_sampling(self):
+        return not (self.regs[_PWR_MGMT_1] & (1 << 6))
+
+    def advance(self, us):
+        """
+    .. method:: advance(us)
+
+        Advance the model time by *us* microseconds, producing the samples falling in that interval.
+
+        """
+        end = self.time_us + us
+        if not self.is_sampling():
+            self.time_us = end
+            self._next_sample_us = end
+            return
+        while self._next_sample_us <= end:
+            self.time_us = self._next_sample_us
+            self._sample()
+            self._next_sample_us += 1000000 / self.output_rate()
+        self.time_us = end
+        self._raise_int()
+
+    def _raise_int(self):
+        # the handler reads the sensor, which advances the time again: don't nest
+        if self._in_int or self.int_handler is None:
+            return
+        self._in_int = True
+        try:
+            while self._int_pending:
+                self._int_pending = False
+                self.int_handler()
+        finally:
+            self._in_int = False
+
+    def _sample(self):
+        values = self.motion(self.samples, self.time_us / 1000000)
+        self.samples += 1
+
+        accel_sens = _ACCEL_SENSITIVITY[(self.regs[_ACCEL_CONFIG] >> 3) & 0b11]
+        gyro_sens = _GYRO_SENSITIVITY[(self.regs[_GYRO_CONFIG] >> 3) & 0b11]
+        stby = self.regs[_PWR_MGMT_2]
+
+        raw = [0] * 7
+        for i in range(3):
+            # accel offsets are in +-16g format, bit 0 is reserved
+            offs = _s16(self.regs[_XA_OFFS_H + 2 * i], self.regs[_XA_OFFS_H + 2 * i + 1]) & ~1
+            raw[i] = values[i] * accel_sens + self.bias[i] + offs * accel_sens / 2048
+            # gyro offsets are in +-1000dps format
+            offs = _s16(self.regs[_XG_OFFS_USRH + 2 * i], self.regs[_XG_OFFS_USRH + 2 * i + 1])
+            raw[4 + i] = values[4 + i] * gyro_sens + self.bias[3 + i] + offs * gyro_sens / 32.8
+            if stby & (1 << (5 - i)):
+                raw[i] = 0
+            if stby & (1 << (2 - i)):
+                raw[4 + i] = 0
+        raw[3] = (values[3] - 36.53) * 340
+
+        data = bytearray(14)
+        for i in range(7):
+            v = _clamp16(raw[i]) & 0xFFFF
+            data[2 * i] = v >> 8
+            data[2 * i + 1] = v & 0xFF
+        self.regs[_ACCEL_XOUT_H:_ACCEL_XOUT_H + 14] = data
+
+        self.regs[_INT_STATUS] |= 1
+        if self.regs[_USER_CTRL] & (1 << 6):
+            self._push_fifo(data)
+        if self.regs[_INT_ENABLE] & 1:
+            # a latched INT pin stays asserted until the status is cleared: no new edge
+            if not self._int_asserted:
+                self._int_pending = True
+            self._int_asserted = bool(self.regs[_INT_PIN_CFG] & (1 << 5))
+
+    def _push_fifo(self, data):
+        en = self.regs[_FIFO_EN]
+        frame = bytearray()
+        if en & (1 << 3):
+            frame += data[0:6]
+        if en & (1 << 7):
+            frame += data[6:8]
+        if en & (1 << 6):
+            frame += data[8:10]
+        if en & (1 << 5):
+            frame += data[10:12]
+        if en & (1 << 4):
+            frame += data[12:14]
+        self.inject_fifo(frame)
+
+    def inject_fifo(self, data):
+        """
+    .. method:: inject_fifo(data)
+
+        Append *data* to the FIFO, as the DMP would do with its packets.
+
+        """
+        self.fifo += data
+        if len(self.fifo) > _FIFO_SIZE:
+            # oldest bytes are overwritten: frame boundaries are lost
+            del self.fifo[:len(self.fifo) - _FIFO_SIZE]
+            self.regs[_INT_STATUS] |= (1 << 4)
+
+    def trigger_motion(self, status):
+        """
+    .. method:: trigger_motion(status)
+
+        Raise MOT_INT with *status* as MOT_DETECT_STATUS value (axis and polarity bits).
+
+        """
+        self.regs[_MOT_DETECT_STATUS] = status & 0xFE
+        self.regs[_INT_STATUS] |= (1 << 6)
+
+    def trigger_zero_motion(self, entered=True):
+        """
+    .. method:: trigger_zero_motion(entered=True)
+
+        Raise ZMOT_INT, signalling that the sensor became still (*entered* True) or started moving again.
+
+        """
+        self.regs[_MOT_DETECT_STATUS] = 1 if entered else 0
+        self.regs[_INT_STATUS] |= (1 << 5)
+
+    def read(self, n):
+        """
+    .. method:: read(n)
+
+        Read *n* bytes starting from the current register pointer, applying the read side effects.
+
+        """
+        out = bytearray(n)
+        for i in range(n):
+            out[i] = self._read_reg(self._pointer)
+            # FIFO_R_W and MEM_R_W do not auto-increment
+            if self._pointer != _FIFO_R_W and self._pointer != _MEM_R_W:
+                self._pointer = (self._pointer + 1) & 0x7F
+        if self.regs[_INT_PIN_CFG] & (1 << 4):
+            # INT_RD_CLEAR: any read clears the interrupt status
+            self.regs[_INT_STATUS] = 0
+            self._int_asserted = False
+        return bytes(out)
+
+    def _read_reg(self, reg):
+        if reg == _FIFO_R_W:
+            if not self.fifo:
+                return 0xFF
+            value = self.fifo[0]
+            del self.fifo[0]
+            return value
+        if reg == _MEM_R_W:
+            value = self.mem[self._mem_address()]
+            self._mem_increment()
+            return value
+        if reg == _FIFO_COUNTH:
+            return len(self.fifo) >> 8
+        if reg == _FIFO_COUNTL:
+            return len(self.fifo) & 0xFF
+        value = self.regs[reg]
+        if reg == _INT_STATUS:
+            self.regs[_INT_STATUS] = 0
+            self._int_asserted = False
+        elif reg == _MOT_DETECT_STATUS:
+            self.regs[_MOT_DETECT_STATUS] = 0
+        return value
+
+    def _mem_address(self):
+        return ((self.regs[_BANK_SEL] & 0x1F) << 8 | self.regs[_MEM_START_ADDR]) % _DMP_MEMORY_SIZE
+
+    def _mem_increment(self):
+        # the address wraps inside the bank
+        self.regs[_MEM_START_ADDR] = (self.regs[_MEM_START_ADDR] + 1) & 0xFF
+
+    def write(self, data):
+        """
+    .. method:: write(data)
+
+        Handle a write transaction: the first byte sets the register pointer, the others are written
+        with auto-increment.
+
+        """
+        if not data:
+            return
+        self._pointer = data[0] & 0x7F
+        for value in data[1:]:
+            self._write_reg(self._pointer, value)
+            if self._pointer != _FIFO_R_W and self._pointer != _MEM_R_W:
+                self._pointer = (self._pointer + 1) & 0x7F
+
+    def _write_reg(self, reg, value):
+        if reg in (_WHO_AM_I, _INT_STATUS, _FIFO_COUNTH, _FIFO_COUNTL, _MOT_DETECT_STATUS):
+            return
+        if reg >= _ACCEL_XOUT_H and reg < _ACCEL_XOUT_H + 14:
+            return
+        if reg == _FIFO_R_W:
+            return
+        if reg == _MEM_R_W:
+            self.mem[self._mem_address()] = value
+            self._mem_increment()
+            return
+        if reg == _PWR_MGMT_1 and (value & (1 << 7)):
+            self.reset()
+            return
+        if reg == _USER_CTRL and (value & (1 << 2)):
+            # FIFO_RESET is self clearing and works only while FIFO_EN is 0
+            if not (self.regs[_USER_CTRL] & (1 << 6)):
+                self.fifo = bytearray()
+            value &= ~(1 << 2)
+        if reg == _USER_CTRL:
+            # DMP_RESET is self clearing
+            value &= ~(1 << 3)
+        self.regs[reg] = value
+        if reg in (_SMPLRT_DIV, _CONFIG, _PWR_MGMT_1, _PWR_MGMT_2) and self.is_sampling():
+            # a faster output rate takes effect right away
+            next_sample = self.time_us + 1000000 / self.output_rate()
+            if next_sample < self._next_sample_us:
+                self._next_sample_us = next_sample
+
+
+class SimBus():
+    """
+.. class:: SimBus(clock=400000)
+
+    Simulated I2C bus, to be passed to :class:`MPU6050` in place of the I2C driver name.
+
+    :param clock: is the bus clock in Hz, used to account the time spent on the bus.
+
+    Every transaction advances the simulated time of the attached models by its duration on the wire
+    and is accounted in the counters returned by :meth:`stats`.
+
+    """
+
+    def __init__(self, clock=400000):
+        self.clock = clock
+        self.devices = {}
+        self.time_us = 0
+        self.reset_stats()
+
+    def attach(self, model, addr=0x68):
+        """
+    .. method:: attach(model, addr=0x68)
+
+        Attach *model* to the bus at address *addr*. Return *model*.
+
+        """
+        self.devices[addr] = model
+        model.time_us = self.time_us
+        model._next_sample_us = self.time_us
+        return model
+
+    def reset_stats(self):
+        """
+    .. method:: reset_stats()
+
+        Reset the transaction counters.
+
+        """
+        self.transactions = 0
+        self.reads = 0
+        self.writes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.bus_time_us = 0
+
+    def stats(self):
+        """
+    .. method:: stats()
+
+        Return a dictionary with the number of transactions, reads, writes, bytes read, bytes written and the bus time in microseconds.
+
+        """
+        return {
+            'transactions': self.transactions,
+            'reads': self.reads,
+            'writes': self.writes,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'bus_time_us': self.bus_time_us
+        }
+
+    def advance(self, us):
+        """
+    .. method:: advance(us)
+
+        Advance the time of every attached model by *us* microseconds.
+
+        """
+        self.time_us += us
+        for model in self.devices.values():
+            model.advance(us)
+
+    def _account(self, n_bytes):
+        # every byte takes 9 clock cycles, plus start/stop conditions
+        us = (n_bytes * 9 + 2) * 1000000 / self.clock
+        self.transactions += 1
+        self.bus_time_us += us
+        self.advance(us)
+
+    def _device(self, addr):
+        if addr not in self.devices:
+            raise PeripheralError("no device at address " + hex(addr))
+        return self.devices[addr]
+
+    def write(self, addr, data):
+        model = self._device(addr)
+        self.writes += 1
+        self.bytes_written += len(data)
+        self._account(len(data) + 1)
+        model.write(data)
+
+    def write_read(self, addr, data, n):
+        model = self._device(addr)
+        self.reads += 1
+        self.bytes_written += len(data)
+        self.bytes_read += n
+        self._account(len(data) + n + 2)
+        model.write(data)
+        return model.read(n)
+
+    def read(self, addr, n):
+        model = self._device(addr)
+        self.reads += 1
+        self.bytes_read += n
+        self._account(n + 1)
+        return model.read(n)
+
+
+def _to_bytes(data):
+    if isinstance(data, int):
+        return bytes([data])
+    return bytes(data)
+
+
+class I2C():
+    """
+.. class:: I2C(drvname, addr=0, clock=100000)
+
+    Stand-in for the Zerynth ``i2c.I2C`` class, forwarding every transaction to the :class:`SimBus` passed as *drvname*.
+
+    """
+
+    def __init__(self, drvname, addr=0, clock=100000):
+        if not isinstance(drvname, SimBus):
+            raise PeripheralError("a SimBus is required")
+        self._bus = drvname
+        self.addr = addr
+        self.clock = clock
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_addr(self, addr):
+        self.addr = addr
+
+    def write(self, data, timeout=-1):
+        self._bus.write(self.addr, _to_bytes(data))
+
+    def write_bytes(self, *args, timeout=-1):
+        self._bus.write(self.addr, bytes(args))
+
+    def read(self, n, timeout=-1):
+        return self._bus.read(self.addr, n)
+
+    def write_read(self, data, n, timeout=-1):
+        return self._bus.write_read(self.addr, _to_bytes(data), n)
+
+
+# current simulated time source for the Zerynth builtins
+_clock_bus = None
+
+# interrupt handlers registered through onPinRise/onPinFall, by pin
+pin_handlers = {}
+
+
+def _sleep(ms, *args):
+    if _clock_bus is not None:
+        _clock_bus.advance(ms * 1000)
+
+
+def _pin_mode(pin, mode):
+    pass
+
+
+def _on_pin(pin, fun, *args, **kwargs):
+    if fun is None:
+        pin_handlers.pop(pin, None)
+    else:
+        pin_handlers[pin] = fun
+
+
+def connect_int(model, pin):
+    """
+.. function:: connect_int(model, pin)
+
+    Wire the INT pin of *model* to *pin*: the handler registered on *pin* is called whenever the model raises the Data Ready interrupt.
+
+    """
+    def handler():
+        fun = pin_handlers.get(pin)
+        if fun is not None:
+            fun()
+    model.int_handler = handler
+
+
+class _Timers():
+    @staticmethod
+    def now():
+        if _clock_bus is None:
+            return 0
+        return int(_clock_bus.time_us // 1000)
+
+
+def install(bus=None):
+    """
+.. function:: install(bus=None)
+
+    Register this module as the ``i2c`` module and provide the Zerynth builtins used by the driver
+    (``sleep``, ``PeripheralError``, ``pinMode``, ``onPinRise``, ``onPinFall``, ``INPUT``, ``INPUT_PULLUP``, ``PINT``)
+    and a ``timers`` module. ``sleep`` and ``timers.now`` follow the simulated time of *bus*.
+    Call it before importing the driver.
+
+    """
+    global _clock_bus
+    _clock_bus = bus
+    sys.modules['i2c'] = sys.modules[__name__]
+    sys.modules['timers'] = _Timers
+    builtins.sleep = _sleep
+    builtins.PeripheralError = PeripheralError
+    builtins.pinMode = _pin_mode
+    builtins.onPinRise = _on_pin
+    builtins.onPinFall = _on_pin
+    builtins.INPUT = 0
+    builtins.INPUT_PULLUP = 1
+    builtins.PINT = int
+
+
+def use_clock(bus):
+    """
+.. function:: use_clock(bus)
+
+    Make ``sleep`` and ``timers.now`` follow the simulated time of *bus*.
+
+    """
+    global _clock_bus
+    _clock_bus = bus
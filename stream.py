@@ -0,0 +1,263 @@
+# Zerynth - libs - invensense-mpu6050/stream.py
+#
+# Zerynth library for timestamped MPU6050 sample streams
+#
+# @Date: 2026-10-16
+
+"""
+.. module:: stream
+
+*************
+Stream Module
+*************
+
+This module contains a timestamped sample stream for the MPU6050 driver.
+Every sample is paired with the time it was taken (in milliseconds, on the ``timers.now()`` clock), so that
+integrations over time (velocity, orientation) can use the actual dt between samples.
+
+* Direct reads are timestamped at the instant the data ready flag is seen.
+* FIFO frames are timestamped backwards from the drain time, one sample period apart. The period starts from the
+  configured sample rate and is then estimated from the frames counted between drains, so that the timestamps follow
+  the actual rate of the sensor clock.
+
+The stream also keeps statistics of the intervals between consecutive timestamps (jitter).
+
+"""
+
+import timers
+
+# weight of each new measure in the sample period estimate
+PERIOD_GAIN = 0.1
+
+
+class SampleStream():
+    """
+
+===================
+ SampleStream class
+===================
+
+.. class:: SampleStream(sensor)
+
+    Creates a timestamped stream of samples read from *sensor*, an :class:`MPU6050` instance.
+
+    The sample rate of the sensor is read once when the stream is created: create a new stream (or call
+    :meth:`set_rate`) after changing it. ::
+
+        from invensense.mpu6050 import mpu6050
+        from invensense.mpu6050 import stream
+
+        ...
+
+        mpu = mpu6050.MPU6050(I2C0)
+        mpu.set_sample_rate(100)
+
+        samples = stream.SampleStream(mpu)
+        for t, values in samples.samples(100):
+            print(t, values)
+        print(samples.stats())
+
+    """
+
+    def __init__(self, sensor):
+        self.sensor = sensor
+        self.set_rate(sensor.get_sample_rate())
+        self.reset_stats()
+
+    def set_rate(self, rate):
+        """
+    .. method:: set_rate(rate)
+
+        :param rate: is the sample rate of the sensor in Hz.
+
+        Set the nominal sample rate used to reconstruct the timestamps of the FIFO frames and restart the
+        estimate of the actual sample period from it.
+
+        """
+        if (rate <= 0):
+            raise ValueError
+
+        self.period = 1000 / rate
+        # time of the last drain and frames left in the FIFO by it, for the period estimate
+        self._t_ref = None
+        self._backlog = 0
+        # smoothed time and frames between drains
+        self._dt_acc = 0
+        self._n_acc = 0
+
+    def reset_stats(self):
+        """
+    .. method:: reset_stats()
+
+        Reset the interval statistics.
+
+        """
+        self._last = None
+        self._count = 0
+        self._dt_min = 0
+        self._dt_max = 0
+        self._dt_mean = 0
+        # sum of squared differences from the mean (Welford)
+        self._dt_m2 = 0
+
+    ##
+    ## @brief      Account the timestamp of a new sample in the interval statistics.
+    ##
+    ## @param      self
+    ## @param      t    is the timestamp of the sample in milliseconds.
+    ## @return     nothing
+    ##
+    def _account(self, t):
+        last = self._last
+        self._last = t
+        if (last is None):
+            return
+
+        dt = t - last
+        self._count += 1
+        if (self._count == 1):
+            self._dt_min = dt
+            self._dt_max = dt
+        elif (dt < self._dt_min):
+            self._dt_min = dt
+        elif (dt > self._dt_max):
+            self._dt_max = dt
+        delta = dt - self._dt_mean
+        self._dt_mean += delta / self._count
+        self._dt_m2 += delta * (dt - self._dt_mean)
+
+    def stats(self):
+        """
+    .. method:: stats()
+
+        Return a dictionary with the statistics of the intervals between consecutive timestamps:
+
+        ========== =============================================
+         key        value
+        ========== =============================================
+         count      number of intervals
+         dt_min     shortest interval, in milliseconds
+         dt_max     longest interval, in milliseconds
+         dt_mean    mean interval, in milliseconds
+         jitter     standard deviation of the intervals, in milliseconds
+        ========== =============================================
+
+        """
+        jitter = 0
+        if (self._count > 1):
+            jitter = (self._dt_m2 / (self._count - 1)) ** 0.5
+        return {
+            'count': self._count,
+            'dt_min': self._dt_min,
+            'dt_max': self._dt_max,
+            'dt_mean': self._dt_mean,
+            'jitter': jitter
+        }
+
+    def samples(self, n=None, g=False, poll=1):
+        """
+    .. method:: samples(n=None, g=False, poll=1)
+
+        :param n: is the number of samples to yield. If None, the stream never ends.
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+        :param poll: is the time in milliseconds to wait between two checks of the data ready flag.
+
+        Yield lists [t, values] where values is a list [temp, accel, gyro] (see :meth:`MPU6050.get_values`) read as soon as
+        the data ready flag is seen and t is the time the flag was seen.
+
+        ``timers.now()`` has a resolution of one millisecond: at sample rates close to 1kHz or above, the intervals and
+        the jitter reported by :meth:`stats` mostly reflect the rounding of the clock, not the actual timing.
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        sensor = self.sensor
+        count = 0
+        while (n is None or count < n):
+            if (not sensor.is_data_ready()):
+                sleep(poll)
+                continue
+            t = timers.now()
+            values = sensor.get_values(g)
+            self._account(t)
+            count += 1
+            yield [t, values]
+
+    def fifo_samples(self, buf, g=False):
+        """
+    .. method:: fifo_samples(buf, g=False)
+
+        :param buf: is a bytearray used to drain the FIFO (see :meth:`MPU6050.read_fifo`).
+        :param g: is the format of accelerometer values.
+                  If g = False is m/s^2, otherwise is g.
+                  Default value is False.
+
+        Drain the FIFO once and yield lists [t, values], where values is a decoded frame (see :meth:`MPU6050.fifo_values`).
+        Frames are timestamped one sample period apart, continuing the timestamps of the previous drain as long as
+        the newest frame falls within one period before the drain time (less the frames left in the FIFO when *buf*
+        is full); otherwise the newest frame is anchored to the drain time. So the timestamps never run ahead of the
+        clock and never drift away from it. Timestamps never go backwards: when the reconstructed timestamps would
+        overlap with the previous drain, they are spread between the previous timestamp and the newest one.
+
+        The sample period (the ``period`` attribute, in milliseconds) is estimated from the number of frames
+        produced between two drains. Drains following a FIFO overflow are not used for the estimate.
+
+        """
+        if (g != True and g != False):
+            raise ValueError
+
+        sensor = self.sensor
+        frames = sensor.read_fifo(buf)
+        t_drain = timers.now()
+        if (frames == 0):
+            if (sensor.get_fifo_gap()):
+                # the FIFO has been restarted: the frames produced since the last drain are unknown
+                self._t_ref = t_drain
+                self._backlog = 0
+            return
+
+        frame_size = sensor.get_fifo_frame_size()
+        backlog = 0
+        if ((frames + 1) * frame_size > len(buf)):
+            # buf is full: newer frames may be left in the FIFO
+            backlog = sensor.get_fifo_count() // frame_size
+
+        if (self._t_ref is not None):
+            produced = frames + backlog - self._backlog
+            dt = t_drain - self._t_ref
+            if (produced > 0 and dt > 0):
+                # ratio of the smoothed sums: the frames counted by a drain depend on the sampling phase
+                if (self._n_acc == 0):
+                    self._dt_acc = dt
+                    self._n_acc = produced
+                else:
+                    self._dt_acc += PERIOD_GAIN * (dt - self._dt_acc)
+                    self._n_acc += PERIOD_GAIN * (produced - self._n_acc)
+                self.period = self._dt_acc / self._n_acc
+        self._t_ref = t_drain
+        self._backlog = backlog
+
+        # the newest frame has been taken within one period before the drain (less the frames left in the FIFO)
+        period = self.period
+        t_max = t_drain - backlog * period
+        last = self._last
+        t_last = t_max
+        if (last is not None):
+            # continue the previous timeline while it stays within the drain window
+            t_last = last + frames * period
+            if (t_last > t_max or t_last < t_max - period):
+                t_last = t_max
+        t = t_last - (frames - 1) * period
+        if (last is not None and t <= last):
+            if (t_last < last):
+                t_last = last
+            period = (t_last - last) / frames
+            t = last + period
+
+        for i in range(frames):
+            self._account(t)
+            yield [t, sensor.decode_fifo_frame(buf, i * frame_size, g)]
+            t += period
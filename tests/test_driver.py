@@ -0,0 +1,208 @@
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import sim
+sim.install()
+
+import mpu6050
+import manager
+import dmp
+
+
+BIAS = (301, -203, 151, 50, -25, 13)
+
+
+class DriverTestCase(unittest.TestCase):
+
+    def make_sensor(self, motion=None, bias=None, **kwargs):
+        self.bus = sim.SimBus()
+        self.model = self.bus.attach(sim.MPU6050Model(motion, bias=bias))
+        sim.use_clock(self.bus)
+        return mpu6050.MPU6050(self.bus, **kwargs)
+
+
+class TestFifo(DriverTestCase):
+
+    def test_overflow_realigns(self):
+        mpu = self.make_sensor(sim.rotating(10))
+        mpu.set_sample_rate(1000)
+        mpu.set_fifo_channels()
+        mpu.enable_fifo(True)
+        self.bus.advance(200000)
+
+        buf = bytearray(240)
+        self.assertEqual(mpu.read_fifo(buf), 0)
+        self.assertEqual(mpu.get_fifo_gap(), 85)
+
+        self.bus.advance(10000)
+        n = mpu.read_fifo(buf)
+        self.assertGreater(n, 0)
+        # the frames are aligned again: accel z of the first frame is 1 g
+        self.assertEqual(mpu6050._tc(buf[4] << 8 | buf[5]), 16384)
+
+    def test_reset_keeps_enable_state(self):
+        mpu = self.make_sensor()
+        mpu.set_fifo_channels()
+        mpu.enable_fifo(True)
+        self.bus.advance(20000)
+        mpu.reset_fifo()
+        self.assertEqual(len(self.model.fifo), 0)
+        self.assertTrue(self.model.regs[0x6A] & (1 << 6))
+
+    def test_group_drain_restarts_all(self):
+        self.bus = sim.SimBus()
+        self.bus.attach(sim.MPU6050Model(sim.rotating(10)))
+        self.bus.attach(sim.MPU6050Model(sim.rotating(10)), 0x69)
+        sim.use_clock(self.bus)
+        a = mpu6050.MPU6050(self.bus)
+        b = mpu6050.MPU6050(self.bus, 0x69)
+        group = manager.MPU6050Group([a, b])
+        a.set_sample_rate(100)
+        b.set_sample_rate(1000)
+        group.start_fifo()
+        self.bus.advance(150000)
+
+        bufs = [bytearray(600), bytearray(600)]
+        self.assertEqual(group.drain_fifo(bufs), 0)
+        # the healthy sensor discarded its frames too, the stats account for them
+        self.assertEqual(a.get_fifo_stats()[0], 0)
+        self.assertGreater(a.get_fifo_stats()[1], 0)
+        self.assertEqual(b.get_fifo_stats()[0], 1)
+
+        self.bus.advance(20000)
+        self.assertGreater(group.drain_fifo(bufs), 0)
+        self.assertEqual(a.get_fifo_gap(), a.get_fifo_stats()[1])
+        self.assertEqual(b.get_fifo_gap(), b.get_fifo_stats()[1])
+
+    def test_dmp_enable_clears_stale_overflow(self):
+        mpu = self.make_sensor()
+        mpu.set_sample_rate(1000)
+        mpu.set_fifo_channels()
+        mpu.enable_fifo(True)
+        self.bus.advance(200000)
+
+        d = dmp.DMP(mpu)
+        d.enable(True)
+        pkt = struct.pack('>4i', 1 << 30, 0, 0, 0) + bytes(26)
+        for i in range(3):
+            self.model.inject_fifo(pkt)
+        self.assertEqual(len(list(d.packets(bytearray(420)))), 3)
+        self.assertEqual(mpu.get_fifo_gap(), 0)
+
+        d.enable(False)
+        self.assertEqual(mpu.get_fifo_frame_size(), 0)
+
+
+class TestCalibration(DriverTestCase):
+
+    def test_residual_bias(self):
+        mpu = self.make_sensor(bias=BIAS)
+        mpu.calibrate(50)
+        self.bus.advance(5000)
+        raw = mpu.read_raw()
+        for i in (0, 1, 4, 5, 6):
+            self.assertLessEqual(abs(raw[i]), 8)
+        self.assertLessEqual(abs(raw[2] - 16384), 8)
+
+    def test_refuse_with_axes_off(self):
+        mpu = self.make_sensor()
+        mpu.set_active_axes(accel='xy')
+        self.assertRaises(ValueError, mpu.calibrate, 10)
+        mpu.set_active_axes()
+        mpu.set_low_power_accel(5)
+        self.assertRaises(ValueError, mpu.calibrate, 10)
+        mpu.exit_low_power()
+        mpu.calibrate(10)
+
+    def test_offsets_range(self):
+        mpu = self.make_sensor()
+        self.assertRaises(ValueError, mpu.set_offsets, None, [40000, 0, 0])
+
+
+class TestProfile(DriverTestCase):
+
+    def test_apply_profile(self):
+        mpu = self.make_sensor(bias=BIAS, cache=True)
+        mpu.configure(accel_fullscale=8, dlpf=3, sample_rate=100)
+        mpu.calibrate(20)
+        profile = mpu.export_profile()
+
+        other = self.make_sensor(bias=BIAS, cache=True, profile=profile)
+        self.bus.advance(20000)
+        self.assertEqual(other.get_accel_fullscale(), mpu.get_accel_fullscale())
+        self.assertEqual(other.get_sample_rate(), 100)
+        self.assertEqual(other.get_offsets(), mpu.get_offsets())
+        self.assertEqual(list(other.export_profile()), list(profile))
+
+
+class TestGyroGating(DriverTestCase):
+
+    def test_transitions(self):
+        mpu = self.make_sensor(sim.rotating(10))
+        mpu.setup_motion()
+        mpu.set_gyro_gating(True)
+        self.assertEqual(mpu.update_gyro_gating(), 0)
+
+        self.model.trigger_zero_motion(True)
+        self.assertEqual(mpu.update_gyro_gating(), mpu6050.GYRO_GATED)
+        self.assertTrue(mpu.is_gyro_gated())
+        self.assertEqual(self.model.regs[0x6C] & 0b111, 0b111)
+        self.bus.advance(5000)
+        self.assertEqual(mpu.read_raw()[4:], [0, 0, 0])
+        self.assertRaises(ValueError, mpu.set_active_axes)
+
+        self.model.trigger_motion(mpu6050.MOT_X_POS)
+        self.assertEqual(mpu.update_gyro_gating(), mpu6050.GYRO_RESUMED)
+        self.assertFalse(mpu.is_gyro_gated())
+        self.assertEqual(self.model.regs[0x6C], 0)
+        self.bus.advance(5000)
+        self.assertNotEqual(mpu.read_raw()[6], 0)
+
+    def test_idle_poll_reads_status_only(self):
+        mpu = self.make_sensor()
+        mpu.setup_motion()
+        mpu.set_gyro_gating(True)
+        mpu.enable_stats(True)
+        mpu.update_gyro_gating()
+        self.assertEqual(mpu.stats()['bytes_read'], 1)
+
+    def test_interrupts_restored(self):
+        mpu = self.make_sensor()
+        mpu.set_motion(True)
+        before = self.model.regs[0x38]
+        mpu.set_gyro_gating(True)
+        self.assertEqual(self.model.regs[0x38] & 0b01100000, 0b01100000)
+        mpu.set_gyro_gating(False)
+        self.assertEqual(self.model.regs[0x38], before)
+
+
+class TestStandby(DriverTestCase):
+
+    def test_narrowed_read(self):
+        mpu = self.make_sensor(sim.rotating(10))
+        mpu.enable_stats(True)
+        mpu.set_active_axes(accel='z', gyro='z', temp=False)
+        mpu.reset_stats()
+        raw = mpu.read_raw()
+        self.assertEqual(raw, [0, 0, 16384, 0, 0, 0, 164])
+        self.assertEqual(mpu.stats()['bytes_read'], 10)
+        self.assertIsNone(mpu.get_values()[0])
+
+    def test_low_power_sample_rate(self):
+        mpu = self.make_sensor(sim.rotating(10))
+        mpu.set_low_power_accel(5)
+        self.assertEqual(mpu.get_sample_rate(), 5)
+        self.bus.advance(1000000)
+        self.assertEqual(mpu.read_raw(), [0, 0, 16384, 0, 0, 0, 0])
+        mpu.exit_low_power()
+        self.assertEqual(mpu.get_clock_source(), 1)
+        self.bus.advance(2000)
+        self.assertEqual(mpu.read_raw()[6], 164)
+
+
+if __name__ == '__main__':
+    unittest.main()